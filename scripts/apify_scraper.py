@@ -11,38 +11,140 @@ import os
 import sys
 import json
 import time
+import hashlib
 import datetime
-import requests
-import logging
+import itertools
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterator, AsyncIterator, Sequence
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import aiohttp
+from urllib.parse import urlencode, quote_plus
+
+try:
+    import orjson  # Optional: much faster JSON serialization
+except ImportError:
+    orjson = None
 
 # Import configuration
 from config import (
-    COUNTRIES, JOB_ROLES, JOB_TYPES, EXPERIENCE_LEVELS, REMOTE_SETTINGS, RECENT_JOBS_ONLY,
-    TIME_FILTER, MAX_JOBS_PER_SEARCH, TOTAL_TARGET_JOBS,
-    RESULTS_DIR, LOGS_DIR
+    COUNTRIES, JOB_ROLES_FLAT, JOB_TYPES, EXPERIENCE_LEVELS, REMOTE_SETTINGS, RECENT_JOBS_ONLY,
+    TIME_FILTER, MAX_JOBS_PER_SEARCH, TOTAL_TARGET_JOBS, APIFY_MAX_CONCURRENT_RUNS,
+    APIFY_CACHE_TTL_HOURS, APIFY_REQS_PER_SEC, APIFY_URLS_PER_RUN,
+    APIFY_USE_STRUCTURED_INPUT, RESULTS_DIR, setup_logging
 )
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, "apify_scraper.log")),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("apify_scraper")
+logger = setup_logging("apify_scraper", "apify_scraper.log")
+
+# Cache of completed Apify datasets, keyed by a hash of the actor input
+APIFY_CACHE_DIR = os.path.join(RESULTS_DIR, "cache")
+
+# Shared pool for blocking serialization and file writes, so they don't stall the event loop
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="apify_io")
+
+# Apify run statuses after which a run will not change any more
+APIFY_TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED")
+
+# LinkedIn search URL and filter codes
+LINKEDIN_JOBS_SEARCH_URL = "https://www.linkedin.com/jobs/search/"
+
+# LinkedIn job type codes:
+# F = Full-time, P = Part-time, C = Contract, T = Temporary,
+# V = Volunteer, I = Internship, O = Other
+LINKEDIN_JOB_TYPE_CODES = {
+    "full-time": "F",
+    "part-time": "P",
+    "contract": "C",
+    "temporary": "T",
+    "volunteer": "V",
+    "internship": "I",
+    "other": "O"
+}
+
+# LinkedIn experience level codes:
+# 1 = Internship, 2 = Entry level, 3 = Associate, 4 = Mid-Senior level, 5 = Director, 6 = Executive
+LINKEDIN_EXPERIENCE_CODES = {
+    "internship": "1",
+    "entry": "2",
+    "associate": "3",
+    "mid-senior": "4",
+    "director": "5",
+    "executive": "6"
+}
+
+# LinkedIn remote codes: 1 = On-site, 2 = Remote, 3 = Hybrid
+LINKEDIN_REMOTE_CODES = {
+    "on-site": "1",
+    "remote": "2",
+    "hybrid": "3"
+}
 
 def get_timestamp() -> str:
     """Generate a timestamp for file names."""
     return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
+def iter_search_configs(
+    countries: List[str],
+    job_roles: Union[Dict[str, List[str]], Sequence[Tuple[str, str]]],
+    jobs_per_search: int,
+    job_types: Optional[List[str]] = None,
+    experience_levels: Optional[List[str]] = None,
+    remote_settings: Optional[List[str]] = None,
+    recent_jobs_only: bool = False,
+    time_filter: str = ""
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily generate LinkedIn job search configurations for all combinations of parameters.
+    
+    Args:
+        countries: List of countries to search in
+        job_roles: Dictionary mapping categories to lists of job roles, or an already
+            flattened sequence of (category, role) pairs such as JOB_ROLES_FLAT
+        jobs_per_search: Maximum number of jobs to fetch per search
+        job_types: List of job types (e.g., "full-time", "part-time")
+        experience_levels: List of experience levels
+        remote_settings: List of remote work settings
+        recent_jobs_only: Whether to only include recent jobs
+        time_filter: Time filter for job listings
+    
+    Yields:
+        Dictionaries containing search parameters and metadata
+    """
+    if isinstance(job_roles, dict):
+        flat_roles = [(category, role) for category, roles in job_roles.items() for role in roles]
+    else:
+        flat_roles = job_roles
+    
+    # Optional parameters are the same for every configuration, so build them once
+    filters = {}
+    if job_types:
+        filters["job_types"] = job_types
+    if experience_levels:
+        filters["experience_levels"] = experience_levels
+    if remote_settings:
+        filters["remote_settings"] = remote_settings
+    
+    extra = {"recent_jobs_only": recent_jobs_only}
+    if time_filter:
+        extra["time_filter"] = time_filter
+    
+    for country, (category, role) in itertools.product(countries, flat_roles):
+        yield {
+            "country": country,
+            "category": category,
+            "role": role,
+            "keywords": role,
+            "location": country,
+            "jobs_per_search": jobs_per_search,
+            **filters,
+            **extra
+        }
+
 def create_search_configs(
     countries: List[str],
-    job_roles: Dict[str, List[str]],
+    job_roles: Union[Dict[str, List[str]], Sequence[Tuple[str, str]]],
     jobs_per_search: int,
     job_types: Optional[List[str]] = None,
     experience_levels: Optional[List[str]] = None,
@@ -55,7 +157,8 @@ def create_search_configs(
     
     Args:
         countries: List of countries to search in
-        job_roles: Dictionary mapping categories to lists of job roles
+        job_roles: Dictionary mapping categories to lists of job roles, or a flattened
+            sequence of (category, role) pairs
         jobs_per_search: Maximum number of jobs to fetch per search
         job_types: List of job types (e.g., "full-time", "part-time")
         experience_levels: List of experience levels
@@ -66,306 +169,673 @@ def create_search_configs(
     Returns:
         List of dictionaries containing search parameters and metadata
     """
-    search_configs = []
-    
-    for country in countries:
-        for category, roles in job_roles.items():
-            for role in roles:
-                # Build search parameters dictionary
-                search_params = {
-                    "country": country,
-                    "category": category,
-                    "role": role,
-                    "keywords": role,
-                    "location": country,
-                    "jobs_per_search": jobs_per_search
-                }
-                
-                # Add optional parameters if provided
-                if job_types:
-                    search_params["job_types"] = job_types
-                
-                if experience_levels:
-                    search_params["experience_levels"] = experience_levels
-                
-                if remote_settings:
-                    search_params["remote_settings"] = remote_settings
-                
-                search_params["recent_jobs_only"] = recent_jobs_only
-                
-                if time_filter:
-                    search_params["time_filter"] = time_filter
-                
-                search_configs.append(search_params)
+    search_configs = list(iter_search_configs(
+        countries, job_roles, jobs_per_search, job_types, experience_levels,
+        remote_settings, recent_jobs_only, time_filter
+    ))
     
     logger.info(f"Created {len(search_configs)} search configurations")
     return search_configs
 
-def save_search_configs(configs: List[Dict[str, Any]]) -> str:
+def load_json_bytes(data: bytes) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed.
+    
+    Args:
+        data: Encoded JSON document
+        
+    Returns:
+        Parsed data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def write_json_file(filepath: str, data: Any, pretty: bool = False) -> None:
+    """
+    Serialize data to a JSON file, using orjson when it is installed.
+    
+    Args:
+        filepath: Destination file path
+        data: JSON-serializable data
+        pretty: Whether to indent the output (only worth it for small files)
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        Path(filepath).write_bytes(orjson.dumps(data, option=option))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
+
+def write_jobs_file(filepath: str, timestamp: str, jobs: List[Dict[str, Any]]) -> None:
+    """
+    Save scraped jobs as JSON Lines: a header line with the timestamp, then one job per line.
+    
+    Each job is serialized and written on its own, so the whole file never has to be
+    held in memory as one string.
+    
+    Args:
+        filepath: Destination file path
+        timestamp: Run timestamp stored in the header line
+        jobs: Scraped jobs
+    """
+    if orjson is not None:
+        dumps = orjson.dumps
+    else:
+        dumps = lambda data: json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    with open(filepath, 'wb') as f:
+        f.write(dumps({'timestamp': timestamp}) + b"\n")
+        for job in jobs:
+            f.write(dumps(job) + b"\n")
+
+def load_jobs_file(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Load the jobs saved by write_jobs_file, or from an older jobs_*.json file.
+    
+    Args:
+        filepath: Path to a jobs_*.jsonl or jobs_*.json file
+        
+    Returns:
+        List of scraped jobs
+    """
+    if not filepath.endswith('.jsonl'):
+        return load_json_bytes(Path(filepath).read_bytes()).get('jobs', [])
+    
+    with open(filepath, 'rb') as f:
+        next(f, None)  # Header line with the run timestamp
+        return [load_json_bytes(line) for line in f if line.strip()]
+
+def save_search_configs(configs: List[Dict[str, Any]], timestamp: Optional[str] = None) -> str:
     """
     Save search configurations to a JSON file.
     
     Args:
         configs: List of search configuration dictionaries
+        timestamp: Run timestamp shared with the results file (defaults to now)
         
     Returns:
         Path to the saved file
     """
-    os.makedirs(os.path.dirname(RESULTS_DIR), exist_ok=True)
-    
-    timestamp = get_timestamp()
+    timestamp = timestamp or get_timestamp()
     filename = f"search_configs_{timestamp}.json"
     filepath = os.path.join(RESULTS_DIR, filename)
     
-    with open(filepath, 'w') as f:
-        json.dump(configs, f, indent=2)
+    write_json_file(filepath, configs, pretty=True)
     
     logger.info(f"Saved {len(configs)} search configurations to {filepath}")
     return filepath
 
-async def run_apify_linkedin_scraper(api_key: str, search_configs: List[Dict[str, Any]]) -> Dict[str, Any]:
+@lru_cache(maxsize=4096)
+def build_linkedin_url(
+    keywords: str,
+    location: str,
+    job_types: Tuple[str, ...] = (),
+    experience_levels: Tuple[str, ...] = (),
+    remote_settings: Tuple[str, ...] = (),
+    time_filter: str = "",
+    recent_jobs_only: bool = False
+) -> str:
     """
-    Run the Apify LinkedIn Jobs Scraper using their API.
+    Build a LinkedIn job search URL for the given search parameters.
+    
+    The result is memoized, so repeated (keywords, location, filters) combinations
+    are only encoded once.
     
     Args:
-        api_key: Apify API key
-        search_configs: List of search configuration dictionaries
+        keywords: Search keywords (usually the job role)
+        location: Search location (usually the country)
+        job_types: Job types (e.g., "full-time", "part-time")
+        experience_levels: Experience levels (e.g., "mid-senior", "director")
+        remote_settings: Remote work settings (e.g., "remote", "hybrid")
+        time_filter: LinkedIn time filter (e.g., "r604800")
+        recent_jobs_only: Whether to restrict results to the last 30 days
         
     Returns:
-        Dictionary containing results and metadata
+        LinkedIn job search URL
     """
-    # Generate URLs for each search configuration
-    urls = []
-    for config in search_configs:
-        # Build LinkedIn search URL with all parameters
-        base_url = "https://www.linkedin.com/jobs/search/"
-        params = []
-        
-        # Add keywords
-        if "keywords" in config:
-            keywords = config["keywords"].replace(" ", "%20")
-            params.append(f"keywords={keywords}")
-        
-        # Add location
-        if "location" in config:
-            location = config["location"].replace(" ", "%20")
-            params.append(f"location={location}")
-        
-        # Add job types filter
-        if "job_types" in config and config["job_types"]:
-            # LinkedIn job type codes:
-            # F = Full-time, P = Part-time, C = Contract, T = Temporary, 
-            # V = Volunteer, I = Internship, O = Other
-            type_codes = {
-                "full-time": "F",
-                "part-time": "P",
-                "contract": "C",
-                "temporary": "T",
-                "volunteer": "V",
-                "internship": "I",
-                "other": "O"
-            }
-            filter_values = [type_codes.get(t.lower(), "F") for t in config["job_types"] if t.lower() in type_codes]
-            if filter_values:
-                job_types_param = ",".join([f"f_JT={code}" for code in filter_values])
-                params.append(job_types_param)
-        
-        # Add experience levels filter
-        if "experience_levels" in config and config["experience_levels"]:
-            # LinkedIn experience level codes:
-            # 1 = Internship, 2 = Entry level, 3 = Associate, 4 = Mid-Senior level, 5 = Director, 6 = Executive
-            exp_codes = {
-                "internship": "1",
-                "entry": "2",
-                "associate": "3",
-                "mid-senior": "4",
-                "director": "5",
-                "executive": "6"
-            }
-            filter_values = [exp_codes.get(e.lower(), "4") for e in config["experience_levels"] if e.lower() in exp_codes]
-            if filter_values:
-                exp_levels_param = ",".join([f"f_E={code}" for code in filter_values])
-                params.append(exp_levels_param)
+    params = []
+    
+    # Add keywords and location
+    if keywords:
+        params.append(("keywords", keywords))
+    
+    if location:
+        params.append(("location", location))
+    
+    # Add job types, experience levels and remote settings filters.
+    # LinkedIn expects multiple values for a filter as a single comma-separated parameter.
+    for param_name, values, codes in (
+        ("f_JT", job_types, LINKEDIN_JOB_TYPE_CODES),
+        ("f_E", experience_levels, LINKEDIN_EXPERIENCE_CODES),
+        ("f_WT", remote_settings, LINKEDIN_REMOTE_CODES)
+    ):
+        filter_values = [codes[value.lower()] for value in values if value.lower() in codes]
+        if filter_values:
+            params.append((param_name, ",".join(filter_values)))
+    
+    # Add time filter
+    if time_filter:
+        params.append(("f_TPR", time_filter))
+    
+    # Add recent jobs filter
+    if recent_jobs_only:
+        params.append(("f_TPR", "r2592000"))  # Last 30 days
+    
+    # Construct the final URL (urlencode escapes spaces, '&', '?' and non-ASCII characters)
+    if not params:
+        return LINKEDIN_JOBS_SEARCH_URL
+    return LINKEDIN_JOBS_SEARCH_URL + "?" + urlencode(params, quote_via=quote_plus)
+
+def build_actor_search_input(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the structured actor input for a search configuration.
+    
+    Used instead of a LinkedIn search URL when APIFY_USE_STRUCTURED_INPUT is enabled.
+    
+    Args:
+        config: Search configuration dictionary
         
-        # Add remote settings filter
-        if "remote_settings" in config and config["remote_settings"]:
-            # LinkedIn remote codes: 1 = On-site, 2 = Remote, 3 = Hybrid
-            remote_codes = {
-                "on-site": "1",
-                "remote": "2",
-                "hybrid": "3"
-            }
-            filter_values = [remote_codes.get(r.lower(), "1") for r in config["remote_settings"] if r.lower() in remote_codes]
-            if filter_values:
-                remote_param = ",".join([f"f_WT={code}" for code in filter_values])
-                params.append(remote_param)
+    Returns:
+        Dictionary of structured search fields for the Apify actor
+    """
+    time_filter = config.get("time_filter", "")
+    if not time_filter and config.get("recent_jobs_only", False):
+        time_filter = "r2592000"  # Last 30 days
+    
+    return {
+        "searchKeywords": config.get("keywords", ""),
+        "locationName": config.get("location", ""),
+        "jobType": [
+            LINKEDIN_JOB_TYPE_CODES[value.lower()] for value in config.get("job_types") or []
+            if value.lower() in LINKEDIN_JOB_TYPE_CODES
+        ],
+        "experienceLevel": [
+            LINKEDIN_EXPERIENCE_CODES[value.lower()] for value in config.get("experience_levels") or []
+            if value.lower() in LINKEDIN_EXPERIENCE_CODES
+        ],
+        "workType": [
+            LINKEDIN_REMOTE_CODES[value.lower()] for value in config.get("remote_settings") or []
+            if value.lower() in LINKEDIN_REMOTE_CODES
+        ],
+        "publishedAt": time_filter
+    }
+
+def get_batch_cache_key(run_input: Dict[str, Any]) -> str:
+    """
+    Compute a stable cache key for an Apify actor input.
+    
+    Args:
+        run_input: Actor input dictionary for a batch
         
-        # Add time filter
-        if "time_filter" in config and config["time_filter"]:
-            params.append(f"f_TPR={config['time_filter']}")
+    Returns:
+        Hex digest identifying the batch input
+    """
+    return hashlib.sha1(json.dumps(run_input, sort_keys=True).encode("utf-8")).hexdigest()
+
+def get_batch_cache_path(cache_key: str) -> Path:
+    """
+    Get the path of the cached NDJSON dataset for a batch.
+    
+    Args:
+        cache_key: Cache key returned by get_batch_cache_key
         
-        # Add recent jobs filter
-        if config.get("recent_jobs_only", False):
-            params.append("f_TPR=r2592000")  # Last 30 days
+    Returns:
+        Path of the cache file (which may not exist)
+    """
+    return Path(APIFY_CACHE_DIR) / f"{cache_key}.jsonl"
+
+def load_cached_batch(cache_key: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Load a cached dataset for a batch if it exists and has not expired.
+    
+    Args:
+        cache_key: Cache key returned by get_batch_cache_key
         
-        # Construct the final URL
-        url = base_url
-        if params:
-            url += "?" + "&".join(params)
+    Returns:
+        List of cached jobs, or None if there is no usable cache entry
+    """
+    cache_path = get_batch_cache_path(cache_key)
+    if not cache_path.exists():
+        return None
+    
+    age_hours = (time.time() - cache_path.stat().st_mtime) / 3600
+    if age_hours > APIFY_CACHE_TTL_HOURS:
+        logger.info(f"Cache entry {cache_key} expired ({age_hours:.1f} hours old)")
+        return None
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            return [load_json_bytes(line) for line in f if line.strip()]
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {cache_path}: {str(e)}")
+        return None
+
+async def iter_ndjson_lines(stream: aiohttp.StreamReader, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+    """
+    Yield the non-empty lines of an NDJSON HTTP response body as they arrive.
+    
+    Reads fixed-size chunks rather than using readline(), so very long records
+    (e.g. jobs with large HTML descriptions) are handled.
+    
+    Args:
+        stream: Response body stream
+        chunk_size: Number of bytes to read at a time
         
-        urls.append(url)
-        config["url"] = url  # Store the URL in the config for reference
+    Yields:
+        One JSON document per line, without the trailing newline
+    """
+    buffer = b""
+    async for chunk in stream.iter_chunked(chunk_size):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
     
-    # Calculate jobs per URL to meet the total target
-    urls_count = len(urls)
-    if urls_count > 0:
-        jobs_per_url = min(MAX_JOBS_PER_SEARCH, max(20, TOTAL_TARGET_JOBS // urls_count))
+    if buffer.strip():
+        yield buffer
+
+def load_runs_index() -> Dict[str, str]:
+    """
+    Load the index mapping batch cache keys to in-progress Apify run IDs.
+    
+    Returns:
+        Dictionary mapping cache keys to run IDs
+    """
+    index_path = Path(APIFY_CACHE_DIR) / "runs_index.json"
+    if not index_path.exists():
+        return {}
+    try:
+        return json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def update_runs_index(cache_key: str, run_id: Optional[str]) -> None:
+    """
+    Record (or clear, if run_id is None) the Apify run ID for a batch.
+    
+    Args:
+        cache_key: Cache key returned by get_batch_cache_key
+        run_id: Apify run ID to record, or None to remove the entry
+    """
+    index = load_runs_index()
+    if run_id:
+        index[cache_key] = run_id
     else:
-        jobs_per_url = MAX_JOBS_PER_SEARCH
+        index.pop(cache_key, None)
     
-    # Process in smaller batches to avoid overwhelming the API
-    BATCH_SIZE = 5  # Process 5 URLs at a time
-    total_batches = (urls_count + BATCH_SIZE - 1) // BATCH_SIZE
+    os.makedirs(APIFY_CACHE_DIR, exist_ok=True)
+    index_path = Path(APIFY_CACHE_DIR) / "runs_index.json"
+    index_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiting how many requests are sent per time period.
     
-    logger.info(f"Running Apify LinkedIn Jobs Scraper with {urls_count} URLs in {total_batches} batches")
-    logger.info(f"Requesting {jobs_per_url} jobs per URL (target total: {TOTAL_TARGET_JOBS})")
+    Used as an async context manager around each HTTP call so that concurrent
+    batches share one request budget for the Apify API.
+    """
     
-    all_results = []
-    metadata = {
-        "batches": [],
-        "urls_count": urls_count,
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        """
+        Args:
+            max_rate: Maximum number of requests allowed per time period (also the burst size)
+            time_period: Length of the time period in seconds
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = max_rate
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a request token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                elapsed = now - self._last_refill
+                self._tokens = min(self.max_rate, self._tokens + elapsed * self.max_rate / self.time_period)
+                self._last_refill = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+async def process_batch(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.BoundedSemaphore,
+    limiter: AsyncRateLimiter,
+    batch_urls: List[str],
+    batch_num: int,
+    total_batches: int,
+    jobs_per_url: int,
+    use_cache: bool = True
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Run a single Apify actor run for a batch of LinkedIn search URLs.
+    
+    Successful datasets are cached on disk keyed by the actor input, and the run ID
+    of an in-progress run is recorded so an interrupted process can resume polling
+    it instead of paying for a new run.
+    
+    Args:
+        session: Shared aiohttp session (carrying the Apify authorization header)
+        semaphore: Semaphore bounding the number of concurrent actor runs
+        limiter: Rate limiter shared by all Apify API requests
+        batch_urls: LinkedIn search URLs to scrape in this batch (structured search
+            inputs when APIFY_USE_STRUCTURED_INPUT is enabled)
+        batch_num: Zero-based index of this batch
+        total_batches: Total number of batches in the run
+        jobs_per_url: Number of jobs requested per URL
+        use_cache: If False, ignore cached datasets and always start a new run
+        
+    Returns:
+        Tuple of (list of scraped jobs, batch metadata dictionary)
+    """
+    # Set up the Actor input for this batch
+    # Ensure we request at least 100 jobs per URL to meet the minimum requirement of the Apify actor
+    min_jobs_per_url = max(100, jobs_per_url)
+    run_input = {
+        ("searches" if APIFY_USE_STRUCTURED_INPUT else "urls"): batch_urls,
+        "count": min_jobs_per_url,
+        "scrapeCompany": True,
+        # Debug mode turned off for production
+        "debugLog": False
+    }
+    
+    batch_results = []
+    batch_metadata = {
+        "batch_num": batch_num + 1,
+        "urls": batch_urls,
         "jobs_per_url": jobs_per_url,
-        "successful_batches": 0,
-        "failed_batches": 0,
-        "total_jobs": 0
+        "start_time": datetime.datetime.now().isoformat(),
+        "end_time": None,
+        "success": False,
+        "cached": False,
+        "job_count": 0,
+        "poll_count": 0,
+        "error": None
     }
     
-    # Process URLs in batches
-    for batch_num in range(total_batches):
-        start_idx = batch_num * BATCH_SIZE
-        end_idx = min(start_idx + BATCH_SIZE, urls_count)
-        batch_urls = urls[start_idx:end_idx]
-        
+    cache_key = get_batch_cache_key(run_input)
+    if use_cache:
+        cached_results = load_cached_batch(cache_key)
+        if cached_results is not None:
+            logger.info(f"Using cached results for batch {batch_num + 1}/{total_batches} ({len(cached_results)} jobs)")
+            batch_metadata["success"] = True
+            batch_metadata["cached"] = True
+            batch_metadata["job_count"] = len(cached_results)
+            batch_metadata["end_time"] = datetime.datetime.now().isoformat()
+            return cached_results, batch_metadata
+    
+    async with semaphore:
         logger.info(f"Processing batch {batch_num + 1}/{total_batches} with {len(batch_urls)} URLs")
-        
-        # Set up the Actor input for this batch
-        # Ensure we request at least 100 jobs per URL to meet the minimum requirement of the Apify actor
-        min_jobs_per_url = max(100, jobs_per_url)
-        run_input = {
-            "urls": batch_urls,
-            "count": min_jobs_per_url,
-            "scrapeCompany": True,
-            # Debug mode turned off for production
-            "debugLog": False
-        }
         logger.info(f"Requesting {min_jobs_per_url} jobs per URL to meet the minimum 100 records requirement")
         
-        batch_metadata = {
-            "batch_num": batch_num + 1,
-            "urls": batch_urls,
-            "jobs_per_url": jobs_per_url,
-            "start_time": datetime.datetime.now().isoformat(),
-            "end_time": None,
-            "success": False,
-            "job_count": 0,
-            "error": None
-        }
-        
         try:
-            # Start the Actor run
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
+            # Resume polling a run started by an earlier, interrupted invocation if there is one
+            run_id = load_runs_index().get(cache_key) if use_cache else None
             
-            # Start the Actor run
-            start_url = "https://api.apify.com/v2/acts/curious_coder~linkedin-jobs-scraper/runs?waitForFinish=60"
+            run_status = None
             
-            # The curious_coder/linkedin-jobs-scraper actor expects the input directly, not in a runInput object
-            response = requests.post(
-                start_url,
-                headers=headers,
-                json=run_input
-            )
-            response.raise_for_status()
-            run_info = response.json()
-            run_id = run_info.get("data", {}).get("id")
-            
-            if not run_id:
-                raise ValueError(f"Failed to get run ID from response: {run_info}")
+            async def fetch_run_status():
+                status_url = f"https://api.apify.com/v2/actor-runs/{run_id}"
+                async with limiter:
+                    async with session.get(status_url) as status_response:
+                        status_response.raise_for_status()
+                        status_data = await status_response.json()
+                return status_data.get("data", {}).get("status")
             
-            logger.info(f"Started Apify run with ID: {run_id}")
+            if run_id:
+                logger.info(f"Resuming existing Apify run with ID: {run_id}")
+                try:
+                    run_status = await fetch_run_status()
+                except aiohttp.ClientResponseError as e:
+                    # A deleted or inaccessible run will never resolve; forget it and start fresh
+                    if not 400 <= e.status < 500:
+                        raise
+                    logger.warning(f"Cannot resume Apify run {run_id} ({e.status}), starting a new run")
+                    update_runs_index(cache_key, None)
+                    run_id = None
             
-            # Wait for the run to finish
-            max_wait_time = 300  # 5 minutes
-            wait_time = 0
-            check_interval = 10  # seconds
-            
-            while wait_time < max_wait_time:
-                # Check run status
-                status_url = f"https://api.apify.com/v2/actor-runs/{run_id}"
-                status_response = requests.get(status_url, headers=headers)
-                status_response.raise_for_status()
+            if not run_id:
+                # Start the Actor run
+                start_url = "https://api.apify.com/v2/acts/curious_coder~linkedin-jobs-scraper/runs?waitForFinish=60"
                 
-                status_data = status_response.json()
-                run_status = status_data.get("data", {}).get("status")
+                # The curious_coder/linkedin-jobs-scraper actor expects the input directly, not in a runInput object
+                async with limiter:
+                    async with session.post(start_url, json=run_input) as response:
+                        response.raise_for_status()
+                        run_info = await response.json()
+                run_id = run_info.get("data", {}).get("id")
                 
-                logger.info(f"Run status: {run_status}")
+                if not run_id:
+                    raise ValueError(f"Failed to get run ID from response: {run_info}")
                 
-                if run_status in ["SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED"]:
-                    break
+                logger.info(f"Started Apify run with ID: {run_id}")
+                update_runs_index(cache_key, run_id)
                 
-                # Wait before checking again
+                # waitForFinish=60 means short runs are often already finished here
+                run_status = run_info.get("data", {}).get("status")
+            
+            # Wait for the run to finish, polling with exponential backoff.
+            # A run scrapes its URLs one after another, so allow time in proportion to its size.
+            max_wait_time = max(300, 60 * len(batch_urls))  # At least 5 minutes
+            max_check_interval = 15  # seconds
+            wait_time = 0
+            check_interval = 1  # seconds
+            poll_count = 0
+            
+            while run_status not in APIFY_TERMINAL_STATUSES and wait_time < max_wait_time:
                 await asyncio.sleep(check_interval)
                 wait_time += check_interval
+                check_interval = min(check_interval * 1.5, max_check_interval)
+                
+                # Check run status
+                run_status = await fetch_run_status()
+                poll_count += 1
+                
+                logger.info("Run status: %s", run_status)
+            
+            batch_metadata["poll_count"] = poll_count
             
             # Get the results
             if run_status == "SUCCEEDED":
-                dataset_url = f"https://api.apify.com/v2/actor-runs/{run_id}/dataset/items?format=json"
-                dataset_response = requests.get(dataset_url, headers=headers)
-                dataset_response.raise_for_status()
+                # Stream the dataset as NDJSON: records are parsed as they arrive and the raw
+                # lines go straight into the cache file, so nothing is serialized twice
+                dataset_url = f"https://api.apify.com/v2/actor-runs/{run_id}/dataset/items?format=jsonl&clean=true"
+                cache_path = get_batch_cache_path(cache_key)
+                dataset_timeout = aiohttp.ClientTimeout(total=None, sock_read=120)
+                partial_path = cache_path.with_suffix(".jsonl.partial")
+                os.makedirs(APIFY_CACHE_DIR, exist_ok=True)
                 
-                batch_results = dataset_response.json()
+                try:
+                    async with limiter:
+                        # Large datasets can take longer than the session's total timeout to download
+                        async with session.get(dataset_url, timeout=dataset_timeout) as dataset_response:
+                            dataset_response.raise_for_status()
+                            with open(partial_path, 'wb') as cache_file:
+                                async for line in iter_ndjson_lines(dataset_response.content):
+                                    batch_results.append(load_json_bytes(line))
+                                    cache_file.write(line + b"\n")
+                    
+                    # Only publish the cache entry once the whole dataset has been received
+                    os.replace(partial_path, cache_path)
+                finally:
+                    if partial_path.exists():
+                        partial_path.unlink()
                 
                 job_count = len(batch_results)
-                all_results.extend(batch_results)
+                update_runs_index(cache_key, None)
                 
                 batch_metadata["success"] = True
                 batch_metadata["job_count"] = job_count
                 batch_metadata["end_time"] = datetime.datetime.now().isoformat()
                 
-                metadata["successful_batches"] += 1
-                metadata["total_jobs"] += job_count
-                
                 logger.info(f"Successfully processed batch {batch_num + 1} with {job_count} jobs")
                 
             else:
                 error_msg = f"Run failed or timed out: {run_status}"
                 logger.error(error_msg)
                 
+                # A run that ended unsuccessfully can't be resumed; let the next invocation start fresh
+                if run_status in APIFY_TERMINAL_STATUSES:
+                    update_runs_index(cache_key, None)
+                
                 batch_metadata["success"] = False
                 batch_metadata["error"] = error_msg
                 batch_metadata["end_time"] = datetime.datetime.now().isoformat()
-                
-                metadata["failed_batches"] += 1
         
         except Exception as e:
             error_msg = f"Error processing batch {batch_num + 1}: {str(e)}"
             logger.error(error_msg)
             
+            # Drop any jobs parsed before a download failed partway
+            batch_results = []
             batch_metadata["success"] = False
             batch_metadata["error"] = error_msg
             batch_metadata["end_time"] = datetime.datetime.now().isoformat()
-            
-            metadata["failed_batches"] += 1
         
-        metadata["batches"].append(batch_metadata)
+        return batch_results, batch_metadata
+
+async def run_apify_linkedin_scraper(
+    api_key: str,
+    search_configs: List[Dict[str, Any]],
+    use_cache: bool = True,
+    max_concurrent_runs: int = APIFY_MAX_CONCURRENT_RUNS
+) -> Dict[str, Any]:
+    """
+    Run the Apify LinkedIn Jobs Scraper using their API.
+    
+    Args:
+        api_key: Apify API key
+        search_configs: List of search configuration dictionaries
+        use_cache: If False, bypass cached batch results and start fresh actor runs
+        max_concurrent_runs: Maximum number of actor runs in flight at once
         
-        # Add a delay between batches to avoid rate limiting
-        if batch_num < total_batches - 1:
-            delay = 5  # seconds
-            logger.info(f"Waiting {delay} seconds before next batch...")
-            await asyncio.sleep(delay)
+    Returns:
+        Dictionary containing results and metadata
+    """
+    # Generate the actor input for each search configuration: a LinkedIn search URL,
+    # or the structured search fields when the actor's structured input is enabled
+    urls = []
+    for config in search_configs:
+        if APIFY_USE_STRUCTURED_INPUT:
+            search_input = build_actor_search_input(config)
+            urls.append(search_input)
+            config["actor_input"] = search_input  # Store the input in the config for reference
+            continue
+        
+        # Lists are converted to tuples so identical filter combinations hit the URL cache
+        url = build_linkedin_url(
+            config.get("keywords", ""),
+            config.get("location", ""),
+            tuple(config.get("job_types") or ()),
+            tuple(config.get("experience_levels") or ()),
+            tuple(config.get("remote_settings") or ()),
+            config.get("time_filter", ""),
+            config.get("recent_jobs_only", False)
+        )
+        
+        urls.append(url)
+        config["url"] = url  # Store the URL in the config for reference
+    
+    # Calculate jobs per URL to meet the total target
+    urls_count = len(urls)
+    if urls_count > 0:
+        jobs_per_url = min(MAX_JOBS_PER_SEARCH, max(20, TOTAL_TARGET_JOBS // urls_count))
+    else:
+        jobs_per_url = MAX_JOBS_PER_SEARCH
+    
+    # Submit the URLs in as few actor runs as possible; each run pays container startup
+    # and the per-run minimum, so only very large searches are sharded into several runs
+    batches = [urls[i:i + APIFY_URLS_PER_RUN] for i in range(0, urls_count, APIFY_URLS_PER_RUN)]
+    total_batches = len(batches)
+    
+    logger.info(f"Running Apify LinkedIn Jobs Scraper with {urls_count} URLs in {total_batches} batches")
+    logger.info(f"Requesting {jobs_per_url} jobs per URL (target total: {TOTAL_TARGET_JOBS})")
+    
+    all_results = []
+    metadata = {
+        "batches": [],
+        "urls_count": urls_count,
+        "jobs_per_url": jobs_per_url,
+        "successful_batches": 0,
+        "failed_batches": 0,
+        "total_jobs": 0
+    }
+    
+    # Run all batches concurrently, bounded so only a few actor runs are in flight at once
+    semaphore = asyncio.BoundedSemaphore(max(1, max_concurrent_runs))
+    # ...and rate limited so overlapping batches still respect the Apify API rate
+    limiter = AsyncRateLimiter(APIFY_REQS_PER_SEC)
+    timeout = aiohttp.ClientTimeout(total=120)
+    
+    # Authenticate once at the session level; aiohttp sets Content-Type for JSON bodies
+    headers = {"Authorization": f"Bearer {api_key}"}
+    
+    # Keep connections to api.apify.com alive across the start, poll and dataset
+    # requests of all runs, and cache its DNS lookup for the duration of the run
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300)
+    
+    async with aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout) as session:
+        batch_outcomes = await asyncio.gather(
+            *[
+                process_batch(
+                    session,
+                    semaphore,
+                    limiter,
+                    batch_urls,
+                    batch_num,
+                    total_batches,
+                    jobs_per_url,
+                    use_cache
+                )
+                for batch_num, batch_urls in enumerate(batches)
+            ],
+            return_exceptions=True
+        )
+    
+    # Merge batch results in their original order
+    for batch_num, outcome in enumerate(batch_outcomes):
+        if isinstance(outcome, BaseException):
+            error_msg = f"Error processing batch {batch_num + 1}: {str(outcome)}"
+            logger.error(error_msg)
+            batch_results = []
+            batch_metadata = {
+                "batch_num": batch_num + 1,
+                "urls": batches[batch_num],
+                "jobs_per_url": jobs_per_url,
+                "start_time": None,
+                "end_time": datetime.datetime.now().isoformat(),
+                "success": False,
+                "cached": False,
+                "job_count": 0,
+                "error": error_msg
+            }
+        else:
+            batch_results, batch_metadata = outcome
+        
+        all_results.extend(batch_results)
+        if batch_metadata["success"]:
+            metadata["successful_batches"] += 1
+            metadata["total_jobs"] += batch_metadata["job_count"]
+        else:
+            metadata["failed_batches"] += 1
+        metadata["batches"].append(batch_metadata)
     
     # Compile final results
     results = {
@@ -375,20 +845,23 @@ async def run_apify_linkedin_scraper(api_key: str, search_configs: List[Dict[str
     
     return results
 
-def save_results(results: Dict[str, Any], search_configs: List[Dict[str, Any]]) -> str:
+def save_results(
+    results: Dict[str, Any],
+    search_configs: List[Dict[str, Any]],
+    timestamp: Optional[str] = None
+) -> str:
     """
     Save scraping results and metadata to a file.
     
     Args:
         results: Dictionary containing scraping results
         search_configs: Original search configurations
+        timestamp: Run timestamp shared with the search configs file (defaults to now)
         
     Returns:
         Path to the saved results file
     """
-    os.makedirs(RESULTS_DIR, exist_ok=True)
-    
-    timestamp = get_timestamp()
+    timestamp = timestamp or get_timestamp()
     filename = f"linkedin_jobs_results_{timestamp}.json"
     filepath = os.path.join(RESULTS_DIR, filename)
     
@@ -399,21 +872,69 @@ def save_results(results: Dict[str, Any], search_configs: List[Dict[str, Any]])
         "results": results
     }
     
-    with open(filepath, 'w') as f:
-        json.dump(output, f, indent=2)
+    # The job payload can be large, so it is written compactly
+    write_json_file(filepath, output)
     
     job_count = len(results.get("jobs", []))
     logger.info(f"Saved {job_count} job results to {filepath}")
     
     return filepath
 
+async def save_search_configs_async(configs: List[Dict[str, Any]], timestamp: Optional[str] = None) -> str:
+    """
+    Save search configurations without blocking the event loop.
+    
+    Args:
+        configs: List of search configuration dictionaries
+        timestamp: Run timestamp shared with the results file (defaults to now)
+        
+    Returns:
+        Path to the saved file
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IO_EXECUTOR, save_search_configs, configs, timestamp)
+
+async def write_jobs_file_async(filepath: str, timestamp: str, jobs: List[Dict[str, Any]]) -> str:
+    """
+    Save scraped jobs with write_jobs_file without blocking the event loop.
+    
+    Args:
+        filepath: Destination file path
+        timestamp: Run timestamp stored in the header line
+        jobs: Scraped jobs
+        
+    Returns:
+        Path to the saved file
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(IO_EXECUTOR, write_jobs_file, filepath, timestamp, jobs)
+    return filepath
+
+async def save_results_async(
+    results: Dict[str, Any],
+    search_configs: List[Dict[str, Any]],
+    timestamp: Optional[str] = None
+) -> str:
+    """
+    Save scraping results without blocking the event loop.
+    
+    Args:
+        results: Dictionary containing scraping results
+        search_configs: Original search configurations
+        timestamp: Run timestamp shared with the search configs file (defaults to now)
+        
+    Returns:
+        Path to the saved results file
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(IO_EXECUTOR, save_results, results, search_configs, timestamp)
+
 async def main():
     """Main execution function."""
     logger.info("Starting LinkedIn job scraping process")
     
-    # Ensure necessary directories exist
-    os.makedirs(RESULTS_DIR, exist_ok=True)
-    os.makedirs(LOGS_DIR, exist_ok=True)
+    # One timestamp for the whole run, so its configs and results files pair up by name
+    run_timestamp = get_timestamp()
     
     # Get Apify API key from environment or prompt
     api_key = os.environ.get("APIFY_API_KEY")
@@ -426,7 +947,7 @@ async def main():
     # Create search configurations with flexible parameters
     search_configs = create_search_configs(
         countries=COUNTRIES,
-        job_roles=JOB_ROLES,
+        job_roles=JOB_ROLES_FLAT,
         jobs_per_search=MAX_JOBS_PER_SEARCH,
         job_types=JOB_TYPES,
         experience_levels=EXPERIENCE_LEVELS,
@@ -434,14 +955,14 @@ async def main():
         recent_jobs_only=RECENT_JOBS_ONLY,
         time_filter=TIME_FILTER
     )
-    config_file = save_search_configs(search_configs)
+    config_file = await save_search_configs_async(search_configs, run_timestamp)
     
     # Run the Apify scraper
     logger.info("Running Apify LinkedIn Jobs Scraper")
     results = await run_apify_linkedin_scraper(api_key, search_configs)
     
     # Save the results
-    results_file = save_results(results, search_configs)
+    results_file = await save_results_async(results, search_configs, run_timestamp)
     
     logger.info(f"Scraping process completed. Results saved to {results_file}")
     
@@ -4,6 +4,7 @@ Contains key parameters for the scraper, LLM analysis, and Google Sheets integra
 """
 
 import os
+import logging
 from pathlib import Path
 
 # Project directories
@@ -12,6 +13,34 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 RESULTS_DIR = os.path.join(BASE_DIR, "results")
 
+# Create the project directories once at import, so callers don't need to
+for _directory in (DATA_DIR, LOGS_DIR, RESULTS_DIR):
+    Path(_directory).mkdir(parents=True, exist_ok=True)
+
+def setup_logging(name: str, log_filename: str) -> logging.Logger:
+    """
+    Get a module logger writing to its own file in LOGS_DIR and to the console.
+    
+    Handlers are attached only the first time, so importing several modules (or
+    re-importing one) doesn't construct duplicate handlers.
+    
+    Args:
+        name: Logger name
+        log_filename: Name of the log file inside LOGS_DIR
+        
+    Returns:
+        Configured logger
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        for handler in (logging.FileHandler(os.path.join(LOGS_DIR, log_filename)), logging.StreamHandler()):
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
 # CV Configuration
 CV_FILE_PATH = os.path.join(DATA_DIR, "cv.md")
 
@@ -21,6 +50,8 @@ JOB_ROLES = {
     "Product Leadership": ["Senior Product Manager", "Director of Product"],
     "Strategic Operations": ["Director of Operations", "Chief of Staff"]
 }
+# JOB_ROLES flattened to (category, role) pairs, the form the search config generator iterates
+JOB_ROLES_FLAT = tuple((category, role) for category, roles in JOB_ROLES.items() for role in roles)
 
 # Job filtering settings
 JOB_TYPES = ["full-time"]  # Options: "full-time", "part-time", "contract", "temporary", "volunteer", "internship"
@@ -30,6 +61,11 @@ RECENT_JOBS_ONLY = True  # Only include jobs posted recently
 
 MAX_JOBS_PER_SEARCH = 30
 TOTAL_TARGET_JOBS = 200
+APIFY_USE_STRUCTURED_INPUT = False  # Send structured search fields to the Apify actor instead of LinkedIn search URLs
+APIFY_URLS_PER_RUN = 200  # Search URLs submitted per Apify actor run (larger searches are split into several runs)
+APIFY_MAX_CONCURRENT_RUNS = 5  # Maximum number of Apify actor runs in flight at once (more mostly adds throttling and retries)
+APIFY_REQS_PER_SEC = 2  # Maximum number of Apify API requests per second across all concurrent runs
+APIFY_CACHE_TTL_HOURS = 12  # Reuse cached results of identical Apify runs for this long (use --force-scrape to bypass)
 
 # LLM Analysis Configuration
 # Available models:
@@ -39,6 +75,14 @@ LLM_MODEL = "claude-3-opus-20240229"
 LLM_PROVIDER = "anthropic"  # Options: "anthropic", "openrouter"
 MAX_JOBS_TO_ANALYZE = 50  # Limit to avoid excessive API costs
 MATCH_SCORE_THRESHOLD = 7.0  # Minimum score (out of 10) for jobs to be considered good matches
+LLM_MAX_CONCURRENT_REQUESTS = 5  # Maximum number of LLM API calls in flight at once
+LLM_USE_BATCH_API = False  # Analyze jobs through the Anthropic Message Batches API (cheaper, but results can take hours)
+LLM_BATCH_MIN_JOBS = 10  # Below this many uncached jobs, send one request per job even with the batch API enabled
+LLM_BATCH_TIMEOUT_MINUTES = 60  # Cancel a message batch still running after this long and analyze its jobs one request each
+LLM_CACHE_FILE = os.path.join(DATA_DIR, "llm_cache")  # Stored analyses (shelve), reused for repeated job descriptions
+LLM_CACHE_TTL_DAYS = 14  # Stored analyses older than this are discarded and the job is analyzed again
+LLM_CACHE_NEAR_DUPLICATES = False  # Also reuse analyses of near-identical descriptions seen in the same run
+LLM_CACHE_SIMILARITY = 0.9  # Minimum description similarity (Jaccard, 0-1) for LLM_CACHE_NEAR_DUPLICATES
 
 # Google Sheets Configuration
 GOOGLE_SHEET_ID = os.environ.get("GOOGLE_SHEET_ID", "1W0M7ckok7FjLnCkdWD9jbrehdIR-adCupPS8ZX3XkSI")  # Use the ID from .env or the most recent one
@@ -7,23 +7,31 @@ for use in LLM prompts. It extracts key sections such as summary, skills, and ex
 """
 
 import os
-import logging
+import re
+import json
+import hashlib
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 
-# Import config for logging directory
-from config import LOGS_DIR
+# Import config for logging setup
+from config import setup_logging, DATA_DIR
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, "cv_parser.log")),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("cv_parser")
+logger = setup_logging("cv_parser", "cv_parser.log")
+
+# Matches level-1 and level-2 Markdown headers ("# Section", "## Subsection")
+CV_HEADER_PATTERN = re.compile(r'^(#{1,2}) (.*)$', re.MULTILINE)
+
+# Matches "- item" / "* item" bullet lines, capturing the item text; the marker
+# must be followed by a space, so "**Bold**" lines aren't bullets
+BULLET_PATTERN = re.compile(r'^[ \t]*[-*][ \t]+(.+?)[ \t]*$', re.MULTILINE)
+
+# Formatted CVs cached across runs, keyed by the hash of the CV file; bump the
+# version when the parsing or formatting output changes
+CV_CACHE_DIR = os.path.join(DATA_DIR, "cache")
+CV_CACHE_VERSION = 2
 
 def parse_markdown_cv(file_path: str) -> Dict[str, str]:
     """
@@ -42,42 +50,37 @@ def parse_markdown_cv(file_path: str) -> Dict[str, str]:
         return {}
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        text = Path(file_path).read_text(encoding='utf-8')
         
         cv_data = {}
+        current_key = None
         current_section = None
-        current_subsection = None
         
-        for line in lines:
+        # Walk the "# Section" / "## Subsection" headers in a single pass and slice the
+        # text between them, collecting the pieces in lists instead of concatenating strings
+        matches = list(CV_HEADER_PATTERN.finditer(text))
+        for i, match in enumerate(matches):
+            body_start = match.end() + 1  # Skip the newline ending the header line
+            body_end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            level, title = match.group(1), match.group(2).strip()
+            
             # Handle main sections (# Section)
-            if line.startswith('# '):
-                current_section = line[2:].strip()
-                current_subsection = None
-                cv_data[current_section] = ""
+            if level == '#':
+                current_section = title
+                current_key = title
+                cv_data[current_section] = []
             
-            # Handle subsections (## Subsection)
-            elif line.startswith('## '):
-                if current_section:
-                    current_subsection = line[3:].strip()
-                    if current_section not in cv_data:
-                        cv_data[current_section] = ""
-                    if current_subsection not in cv_data:
-                        cv_data[current_subsection] = ""
+            # Handle subsections (## Subsection); ignored until a main section starts
+            elif current_section:
+                current_key = title
+                cv_data.setdefault(current_key, [])
             
             # Add content to current section or subsection
-            elif current_section:
-                if current_subsection:
-                    if current_subsection in cv_data:
-                        cv_data[current_subsection] += line
-                    else:
-                        cv_data[current_subsection] = line
-                else:
-                    cv_data[current_section] += line
+            if current_key is not None:
+                cv_data[current_key].append(text[body_start:body_end])
         
-        # Clean up the content (remove trailing whitespace)
-        for key in cv_data:
-            cv_data[key] = cv_data[key].strip()
+        # Join the collected pieces and clean up the content (remove trailing whitespace)
+        cv_data = {key: "".join(parts).strip() for key, parts in cv_data.items()}
         
         logger.info(f"Successfully parsed CV with {len(cv_data)} sections")
         return cv_data
@@ -98,33 +101,101 @@ def format_cv_for_prompt(cv_data: Dict[str, str], max_length: int = 4000) -> str
         Formatted CV text
     """
     prompt_parts = []
+    total_length = 0
+    
+    for part in _iter_prompt_sections(cv_data):
+        separator_length = 2 if prompt_parts else 0  # "\n\n" between parts
+        remaining = max_length - total_length - separator_length
+        
+        # Stop before building an oversized prompt; cut the overflowing section at the
+        # last paragraph break that fits, so the model never sees a half sentence
+        if len(part) > remaining:
+            logger.warning(f"CV content exceeds max length ({max_length}), trimming...")
+            cut = part.rfind("\n\n", 0, remaining)
+            if cut < remaining // 2:
+                cut = remaining
+            if cut > 0:
+                prompt_parts.append(part[:cut].rstrip())
+            prompt_parts.append("[Content truncated due to length]")
+            break
+        
+        prompt_parts.append(part)
+        total_length += separator_length + len(part)
+    
+    # Join all parts with double newlines
+    return "\n\n".join(prompt_parts)
+
+def load_cv_for_prompt(file_path: str) -> str:
+    """
+    Parse a Markdown CV file and format it for an LLM prompt, caching the result on disk.
+    
+    The cache is keyed by the SHA-256 of the file contents, so an unchanged CV only
+    costs a read and a hash: parsing and formatting are skipped on later runs.
+    
+    Args:
+        file_path: Path to the CV Markdown file
+        
+    Returns:
+        Formatted CV text
+    """
+    try:
+        cv_hash = hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+    except OSError as e:
+        logger.error(f"CV file not found: {file_path} ({str(e)})")
+        return ""
     
+    cache_path = os.path.join(CV_CACHE_DIR, f"cv_v{CV_CACHE_VERSION}_{cv_hash}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cv_text = json.load(f)["cv_text"]
+        logger.info(f"Using cached formatted CV for {file_path}")
+        return cv_text
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    cv_data = parse_markdown_cv(file_path)
+    cv_text = format_cv_for_prompt(cv_data)
+    if not cv_data:
+        return cv_text
+    
+    # Write through a temporary file so a concurrent run never reads a partial cache entry
+    try:
+        os.makedirs(CV_CACHE_DIR, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=CV_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"cv_text": cv_text}, f, ensure_ascii=False)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.error(f"Error caching formatted CV: {str(e)}")
+    
+    return cv_text
+
+def _iter_prompt_sections(cv_data: Dict[str, str]) -> Iterator[str]:
+    """
+    Yield the formatted CV sections for the prompt in order of importance.
+    
+    Args:
+        cv_data: Dictionary with CV sections
+        
+    Yields:
+        Formatted section text
+    """
     # Add key sections in a specific order of importance
     priority_sections = ["Summary", "Skills", "Experience", "Education", "Projects"]
     
     for section in priority_sections:
         if section in cv_data and cv_data[section]:
             if section == "Skills":
-                # Format skills as a comma-separated list
-                skills = [skill.strip('- ').strip() for skill in cv_data[section].split('\n') if skill.strip()]
-                prompt_parts.append(f"{section}:\n{', '.join(skills)}")
+                # Format skills as a comma-separated list, one item per non-empty line
+                skills = [line.strip('- ').strip() for line in cv_data[section].split('\n') if line.strip()]
+                yield f"{section}:\n{', '.join(skills)}"
             else:
-                prompt_parts.append(f"{section}:\n{cv_data[section]}")
+                yield f"{section}:\n{cv_data[section]}"
     
     # Add any remaining sections not in the priority list
     for section, content in cv_data.items():
         if section not in priority_sections and content:
-            prompt_parts.append(f"{section}:\n{content}")
-    
-    # Join all parts with double newlines
-    formatted_cv = "\n\n".join(prompt_parts)
-    
-    # Trim if exceeding max length
-    if len(formatted_cv) > max_length:
-        logger.warning(f"CV content exceeds max length ({len(formatted_cv)} > {max_length}), trimming...")
-        formatted_cv = formatted_cv[:max_length] + "...\n[Content truncated due to length]"
-    
-    return formatted_cv
+            yield f"{section}:\n{content}"
 
 def extract_skills(cv_data: Dict[str, str]) -> List[str]:
     """
@@ -136,23 +207,26 @@ def extract_skills(cv_data: Dict[str, str]) -> List[str]:
     Returns:
         List of skills
     """
-    skills = []
+    return list(_parse_skills(cv_data.get("Skills", "")))
+
+@lru_cache(maxsize=32)
+def _parse_skills(skill_text: str) -> Tuple[str, ...]:
+    """
+    Parse the text of a Skills section (cached, as the CV doesn't change during a run).
     
-    if "Skills" in cv_data:
-        # Extract skills from bullet points or comma-separated lists
-        skill_text = cv_data["Skills"]
-        
-        # Try to extract from bullet points first
-        bullet_skills = [line.strip('- ').strip() for line in skill_text.split('\n') if line.strip().startswith('-')]
+    Args:
+        skill_text: Content of the Skills section
         
-        if bullet_skills:
-            skills.extend(bullet_skills)
-        else:
-            # If no bullet points, try comma separation
-            comma_skills = [skill.strip() for skill in skill_text.split(',') if skill.strip()]
-            skills.extend(comma_skills)
-    
-    return skills
+    Returns:
+        Tuple of skills
+    """
+    # Try to extract from bullet points first
+    bullet_skills = BULLET_PATTERN.findall(skill_text)
+    if bullet_skills:
+        return tuple(bullet_skills)
+    
+    # If no bullet points, take the skills one per line, splitting comma-separated lines
+    return tuple(skill.strip() for line in skill_text.split('\n') for skill in line.split(',') if skill.strip())
 
 def extract_experience_summary(cv_data: Dict[str, str], max_items: int = 3) -> str:
     """
@@ -8,61 +8,252 @@ to avoid reprocessing the same jobs when running the scraper daily.
 
 import os
 import json
-import logging
+import atexit
+import itertools
+import queue
 import sqlite3
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Set
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable, Iterator
 
-from config import DATA_DIR, LOGS_DIR
+try:
+    import orjson  # Optional: much faster JSON serialization
+except ImportError:
+    orjson = None
+
+from config import DATA_DIR, setup_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, "job_database.log")),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("job_database")
+logger = setup_logging("job_database", "job_database.log")
 
 # Database path
 DB_PATH = os.path.join(DATA_DIR, "jobs.db")
 
 
-def initialize_database() -> None:
-    """Initialize the SQLite database for job tracking if it doesn't exist."""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Create jobs table if it doesn't exist
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS jobs (
+# Applied once when the connection is opened: WAL journaling (persistent) with
+# synchronous=NORMAL halves the fsyncs per commit and lets readers run alongside
+# the writer; the rest enlarge the page cache and keep temporary tables in memory
+CONNECTION_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-64000",  # 64 MB
+    "mmap_size=268435456",  # 256 MB
+    "foreign_keys=ON"
+)
+
+# Version of the schema created by _create_schema, stored in the database's user_version;
+# bump it whenever the DDL or the migration changes
+SCHEMA_VERSION = 2
+
+# Job dates are stored as integer days since the Unix epoch
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Maximum number of candidate job IDs bound in one anti-join query
+_CANDIDATE_CHUNK_SIZE = 500
+
+# Job dictionary fields stored in the jobs table after job_id, and their defaults
+_JOB_ROW_FIELDS = ("title", "company", "location")
+_JOB_ROW_DEFAULTS = ("", "", "")
+
+# Jobs table definition, shared by schema creation and migration. A WITHOUT ROWID
+# table stores rows clustered by job_id, so lookups take one b-tree search, not two.
+_SQL_CREATE_JOBS_TABLE = """CREATE TABLE {name} (
         job_id TEXT PRIMARY KEY,
         title TEXT,
         company TEXT,
         location TEXT,
-        first_seen_date TEXT,
-        last_checked_date TEXT,
+        first_seen_date INTEGER,  -- Days since the Unix epoch (local date)
+        last_checked_date INTEGER,  -- Days since the Unix epoch (local date)
         is_processed INTEGER DEFAULT 0
-    )
-    ''')
+    ) WITHOUT ROWID"""
+
+# Statements run on every scrape, kept as constants so each one is always the exact
+# same SQL text and is reused from the connection's prepared statement cache
+_SQL_UPSERT_JOB = """
+    INSERT INTO jobs (job_id, title, company, location, first_seen_date, last_checked_date)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(job_id) DO UPDATE SET last_checked_date = excluded.last_checked_date
+"""
+
+_SQL_MARK_PROCESSED = (
+    "UPDATE jobs SET is_processed = 1 WHERE job_id IN (SELECT job_id FROM temp.processed_job_ids)"
+)
+
+_SQL_JOB_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM jobs),
+        (SELECT COUNT(*) FROM jobs WHERE first_seen_date >= ?),
+        (SELECT COUNT(*) FROM jobs WHERE is_processed = 1),
+        (SELECT COUNT(*) FROM scraping_history WHERE timestamp >= ?)
+"""
+
+_SQL_INSERT_SCRAPING_RUN = (
+    "INSERT INTO scraping_history (run_id, timestamp, search_config, job_count, new_job_count) VALUES (?, ?, ?, ?, ?)"
+)
+
+# Scraping runs are recorded by a background thread so the scrape doesn't wait on the commit
+_HISTORY_MAX_BATCH = 100  # Maximum number of queued runs written per transaction
+_HISTORY_CHECKPOINT_EVERY = 10  # Run a passive WAL checkpoint after this many commits
+_history_queue: "queue.Queue[Tuple[Any, ...]]" = queue.Queue()
+_history_thread: Optional[threading.Thread] = None
+_history_lock = threading.Lock()
+
+# Connection shared by all functions in this module, opened on first use
+_conn: Optional[sqlite3.Connection] = None
+
+
+def _get_conn() -> sqlite3.Connection:
+    """
+    Get the module's shared database connection, opening it on first use.
+    
+    The schema is created when the connection is opened, so callers don't need
+    to initialize the database themselves.
     
-    # Create job_scraping_history table for tracking scraping runs
-    cursor.execute('''
+    Returns:
+        SQLite connection to DB_PATH
+    """
+    global _conn
+    
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+        atexit.register(_conn.close)
+        for pragma in CONNECTION_PRAGMAS:
+            _conn.execute(f"PRAGMA {pragma}")
+        _create_schema(_conn)
+    
+    return _conn
+
+
+@contextmanager
+def _write_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run a block in one write transaction, committed on success and rolled back on error.
+    
+    BEGIN IMMEDIATE takes the write lock up front. The implicit transaction of
+    "with conn:" only starts at the first INSERT/UPDATE, leaving the reads before
+    it outside the transaction and the lock upgrade open to SQLITE_BUSY.
+    
+    Args:
+        conn: Database connection
+        
+    Yields:
+        The connection
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _epoch_day(day: date) -> int:
+    """
+    Convert a date to the number of days since the Unix epoch, as stored in the jobs table.
+    
+    Args:
+        day: Date to convert
+        
+    Returns:
+        Days since 1970-01-01
+    """
+    return day.toordinal() - _EPOCH_ORDINAL
+
+
+def _migrate_jobs_table(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild a jobs table created by an older version into the current layout.
+    
+    Older databases store dates as "YYYY-MM-DD" text (converted to integer epoch
+    days here) and/or use a rowid table; the table is rebuilt once, in a single
+    transaction, as a WITHOUT ROWID table with the converted values.
+    
+    Args:
+        conn: Database connection
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone()
+    if row is None:
+        return
+    
+    column_types = {info[1]: info[2] for info in conn.execute("PRAGMA table_info(jobs)")}
+    text_dates = column_types.get("first_seen_date", "").upper() == "TEXT"
+    without_rowid = "WITHOUT ROWID" in row[0].upper()
+    if without_rowid and not text_dates:
+        return
+    
+    if text_dates:
+        # julianday() of a date (midnight) and of the Unix epoch both end in .5, so this yields whole days
+        date_columns = (
+            "CAST(julianday(first_seen_date) - 2440587.5 AS INTEGER), "
+            "CAST(julianday(last_checked_date) - 2440587.5 AS INTEGER)"
+        )
+    else:
+        date_columns = "first_seen_date, last_checked_date"
+    
+    logger.info("Migrating jobs table to the current layout")
+    with _write_transaction(conn):
+        conn.execute(_SQL_CREATE_JOBS_TABLE.format(name="jobs_migrated"))
+        conn.execute(f'''
+        INSERT INTO jobs_migrated
+        SELECT job_id, title, company, location, {date_columns}, is_processed
+        FROM jobs
+        ''')
+        conn.execute("DROP TABLE jobs")
+        conn.execute("ALTER TABLE jobs_migrated RENAME TO jobs")
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    """
+    Create the database tables if they don't exist.
+    
+    Skipped when the database already records the current SCHEMA_VERSION, so opening
+    an up-to-date database costs one pragma read instead of the migration check and DDL.
+    
+    Args:
+        conn: Database connection
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        return
+    
+    # Convert a jobs table from an older database first; the script below then
+    # recreates any indexes the rebuild dropped
+    _migrate_jobs_table(conn)
+    
+    # All DDL runs as one script instead of preparing each statement separately
+    conn.executescript('''
+    -- Jobs seen by the scraper
+    {create_jobs_table};
+    
+    -- Scraping runs
     CREATE TABLE IF NOT EXISTS scraping_history (
         run_id TEXT PRIMARY KEY,
         timestamp TEXT,
         search_config TEXT,
         job_count INTEGER,
         new_job_count INTEGER
-    )
-    ''')
+    );
     
-    conn.commit()
-    conn.close()
+    -- Indexes for the date range and processed counts in get_recent_job_stats
+    CREATE INDEX IF NOT EXISTS idx_jobs_first_seen ON jobs(first_seen_date);
+    CREATE INDEX IF NOT EXISTS idx_jobs_processed ON jobs(is_processed) WHERE is_processed = 1;
+    CREATE INDEX IF NOT EXISTS idx_scraping_history_timestamp ON scraping_history(timestamp);
+    
+    -- No longer created: no query selected unprocessed jobs through it
+    DROP INDEX IF EXISTS idx_jobs_unprocessed;
+    
+    PRAGMA user_version = {schema_version};
+    '''.format(
+        create_jobs_table=_SQL_CREATE_JOBS_TABLE.format(name="IF NOT EXISTS jobs"),
+        schema_version=SCHEMA_VERSION
+    ))
+
+
+def initialize_database() -> None:
+    """Initialize the SQLite database for job tracking if it doesn't exist."""
+    _get_conn()
     logger.info("Job database initialized")
 
 
@@ -73,151 +264,320 @@ def get_known_job_ids() -> Set[str]:
     Returns:
         Set of job IDs as strings
     """
-    initialize_database()
-    
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_conn()
     cursor = conn.cursor()
     
+    # Build the set straight from the cursor rather than materializing a list of rows first
+    cursor.arraysize = 10000
     cursor.execute("SELECT job_id FROM jobs")
-    job_ids = {row[0] for row in cursor.fetchall()}
+    job_ids = {row[0] for row in cursor}
     
-    conn.close()
     return job_ids
 
 
-def add_jobs_to_database(jobs: List[Dict[str, Any]]) -> Dict[str, int]:
+def _upsert_jobs(cursor: sqlite3.Cursor, jobs: List[Dict[str, Any]],
+                 new_count: Optional[int] = None) -> Dict[str, int]:
     """
-    Add new jobs to the database and update existing ones.
+    Insert new jobs and refresh the last checked date of existing ones.
+    
+    Runs as one batched statement; the caller owns the transaction.
     
     Args:
+        cursor: Cursor on the shared connection
         jobs: List of job dictionaries with at least job_id, title, company, and location
+        new_count: Number of the jobs not in the database yet, if already known;
+            otherwise it is counted from the change in the table's row count
         
     Returns:
         Dictionary with counts of new and updated jobs
     """
-    initialize_database()
+    current_date = _epoch_day(date.today())
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # Counting rows scans the whole table, so only do it when the caller can't say
+    if new_count is None:
+        cursor.execute("SELECT COUNT(*) FROM jobs")
+        count_before = cursor.fetchone()[0]
+    
+    # Rows are generated as executemany consumes them, so no list of tuples is built
+    cursor.executemany(_SQL_UPSERT_JOB, _iter_job_rows(jobs, current_date))
+    # Every upserted row counts as one change, whether it was inserted or updated
+    upserted_count = cursor.rowcount
+    
+    if new_count is None:
+        cursor.execute("SELECT COUNT(*) FROM jobs")
+        new_count = cursor.fetchone()[0] - count_before
+    
+    return {"new": new_count, "updated": upserted_count - new_count}
+
+
+def get_job_id(job: Dict[str, Any]) -> str:
+    """
+    Get the ID a job is stored under in the database.
     
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    new_count = 0
-    updated_count = 0
+    Jobs straight from the Apify actor carry their LinkedIn ID as "id"; a "job_id"
+    field takes precedence where one has been set.
+    
+    Args:
+        job: Job dictionary
+        
+    Returns:
+        Job ID as a string, or an empty string if the job has none
+    """
+    return str(job.get("job_id") or job.get("id") or "")
+
+
+def _iter_job_rows(jobs: Iterable[Dict[str, Any]], current_date: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    Generate jobs table rows for the upsert, skipping jobs without an ID.
     
+    Args:
+        jobs: Job dictionaries
+        current_date: Today as days since the Unix epoch
+        
+    Yields:
+        Tuples of upsert parameters
+    """
     for job in jobs:
-        job_id = str(job.get("job_id", ""))
+        job_id = get_job_id(job)
         if not job_id:
             continue
-            
-        # Check if job already exists
-        cursor.execute("SELECT job_id FROM jobs WHERE job_id = ?", (job_id,))
-        exists = cursor.fetchone() is not None
+        # map() looks up all the descriptive columns (with their defaults) in one C-level pass
+        yield (job_id, *map(job.get, _JOB_ROW_FIELDS, _JOB_ROW_DEFAULTS), current_date, current_date)
+
+
+def add_jobs_to_database(jobs: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Add new jobs to the database and update existing ones.
+    
+    Args:
+        jobs: List of job dictionaries with at least job_id, title, company, and location
         
-        if exists:
-            # Update last checked date
-            cursor.execute(
-                "UPDATE jobs SET last_checked_date = ? WHERE job_id = ?",
-                (current_date, job_id)
-            )
-            updated_count += 1
-        else:
-            # Insert new job
-            cursor.execute(
-                "INSERT INTO jobs (job_id, title, company, location, first_seen_date, last_checked_date) VALUES (?, ?, ?, ?, ?, ?)",
-                (
-                    job_id,
-                    job.get("title", ""),
-                    job.get("company", ""),
-                    job.get("location", ""),
-                    current_date,
-                    current_date
-                )
-            )
-            new_count += 1
+    Returns:
+        Dictionary with counts of new and updated jobs
+    """
+    conn = _get_conn()
     
-    conn.commit()
-    conn.close()
+    with _write_transaction(conn):
+        counts = _upsert_jobs(conn.cursor(), jobs)
     
-    logger.info(f"Added {new_count} new jobs and updated {updated_count} existing jobs in database")
-    return {"new": new_count, "updated": updated_count}
+    logger.info(f"Added {counts['new']} new jobs and updated {counts['updated']} existing jobs in database")
+    return counts
 
 
-def mark_jobs_as_processed(job_ids: List[str]) -> int:
+def mark_jobs_as_processed(job_ids: Iterable[str], chunk_size: int = 5000) -> int:
     """
     Mark jobs as processed in the database.
     
+    The IDs are consumed in chunks, each committed separately, so any iterable
+    (including a generator) can be passed without materializing it.
+    
     Args:
-        job_ids: List of job IDs to mark as processed
+        job_ids: Job IDs to mark as processed
+        chunk_size: Number of IDs marked per transaction
         
     Returns:
         Number of jobs marked as processed
     """
-    if not job_ids:
-        return 0
-        
-    initialize_database()
-    
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_conn()
     cursor = conn.cursor()
     
-    # Use parameterized query with a tuple for multiple job_ids
-    placeholders = ", ".join(["?"] * len(job_ids))
-    cursor.execute(
-        f"UPDATE jobs SET is_processed = 1 WHERE job_id IN ({placeholders})",
-        tuple(job_ids)
-    )
+    count = 0
+    chunk_count = 0
+    job_ids_iter = iter(job_ids)
     
-    count = cursor.rowcount
-    conn.commit()
-    conn.close()
+    while True:
+        chunk = list(itertools.islice(job_ids_iter, chunk_size))
+        if not chunk:
+            break
+        chunk_count += 1
+        
+        # Join against a temp table of the IDs instead of one IN list with a placeholder
+        # per job, which fails beyond SQLite's bound variable limit
+        with _write_transaction(conn):
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS processed_job_ids (job_id TEXT PRIMARY KEY)")
+            cursor.execute("DELETE FROM temp.processed_job_ids")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO temp.processed_job_ids (job_id) VALUES (?)",
+                [(str(job_id),) for job_id in chunk]
+            )
+            cursor.execute(_SQL_MARK_PROCESSED)
+            count += cursor.rowcount
+            cursor.execute("DELETE FROM temp.processed_job_ids")
+    
+    if not chunk_count:
+        return 0
     
     logger.info(f"Marked {count} jobs as processed")
     return count
 
 
+def _select_new_job_ids(cursor: sqlite3.Cursor, jobs: List[Dict[str, Any]]) -> Set[str]:
+    """
+    Find which of the given jobs are not in the database yet.
+    
+    Anti-joins the candidate IDs against the jobs table inside SQLite, rather than
+    loading every known job ID into Python. The candidates are passed as an inline
+    VALUES list, in chunks that stay below SQLite's bound variable limit.
+    
+    Args:
+        cursor: Cursor on the shared connection
+        jobs: List of job dictionaries with job_id
+        
+    Returns:
+        Set of job IDs (as strings) that are not in the database
+    """
+    # Jobs without an ID are never stored, so they are never new either
+    candidate_ids = list(dict.fromkeys(filter(None, map(get_job_id, jobs))))
+    new_job_ids = set()
+    
+    for start in range(0, len(candidate_ids), _CANDIDATE_CHUNK_SIZE):
+        chunk = candidate_ids[start:start + _CANDIDATE_CHUNK_SIZE]
+        placeholders = ", ".join(["(?)"] * len(chunk))
+        cursor.execute(
+            f"""
+            WITH candidates(job_id) AS (VALUES {placeholders})
+            SELECT candidates.job_id FROM candidates
+            LEFT JOIN jobs ON jobs.job_id = candidates.job_id
+            WHERE jobs.job_id IS NULL
+            """,
+            chunk
+        )
+        new_job_ids.update(row[0] for row in cursor)
+    
+    return new_job_ids
+
+
 def filter_new_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Filter out jobs that are already in the database.
     
+    Prefer upsert_and_return_new when the jobs are going to be stored anyway.
+    
     Args:
         jobs: List of job dictionaries with job_id
         
     Returns:
         List of jobs that are not already in the database
     """
-    known_job_ids = get_known_job_ids()
+    conn = _get_conn()
+    
+    with conn:
+        new_job_ids = _select_new_job_ids(conn.cursor(), jobs)
     
     # Filter out jobs that are already in the database
-    new_jobs = [job for job in jobs if str(job.get("job_id", "")) not in known_job_ids]
+    new_jobs = [job for job in jobs if get_job_id(job) in new_job_ids]
     
     logger.info(f"Filtered {len(jobs)} total jobs to {len(new_jobs)} new jobs")
     return new_jobs
 
 
+def upsert_and_return_new(jobs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Store jobs in the database and report which of them were new.
+    
+    Combines filter_new_jobs and add_jobs_to_database in a single write transaction,
+    so no other writer can add jobs between the lookup and the upsert.
+    
+    Args:
+        jobs: List of job dictionaries with at least job_id, title, company, and location
+        
+    Returns:
+        Tuple of (jobs that were not in the database before, dictionary with counts
+        of new and updated jobs)
+    """
+    conn = _get_conn()
+    
+    with _write_transaction(conn):
+        cursor = conn.cursor()
+        new_job_ids = _select_new_job_ids(cursor, jobs)
+        counts = _upsert_jobs(cursor, jobs, len(new_job_ids))
+    
+    new_jobs = [job for job in jobs if get_job_id(job) in new_job_ids]
+    
+    logger.info(f"Added {counts['new']} new jobs and updated {counts['updated']} existing jobs in database")
+    return new_jobs, counts
+
+
+def _history_writer() -> None:
+    """
+    Background thread body: write queued scraping runs to the database.
+    
+    Uses its own connection, so its commits never interleave with a transaction
+    open on the shared connection. Whatever has queued up is written in one
+    transaction, and the WAL is checkpointed every few commits.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    commit_count = 0
+    
+    while True:
+        rows = [_history_queue.get()]
+        while len(rows) < _HISTORY_MAX_BATCH:
+            try:
+                rows.append(_history_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        try:
+            with conn:
+                conn.executemany(_SQL_INSERT_SCRAPING_RUN, rows)
+            commit_count += 1
+            if commit_count % _HISTORY_CHECKPOINT_EVERY == 0:
+                conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error:
+            # Retry one by one so a single bad row (e.g. a duplicate run_id) doesn't drop the batch
+            for row in rows:
+                try:
+                    with conn:
+                        conn.execute(_SQL_INSERT_SCRAPING_RUN, row)
+                except sqlite3.Error as e:
+                    logger.error(f"Error recording scraping run {row[0]}: {str(e)}")
+        except Exception as e:
+            # Keep draining the queue, or flush_scraping_history would wait forever
+            logger.error(f"Error recording {len(rows)} scraping runs: {str(e)}")
+        finally:
+            for _ in rows:
+                _history_queue.task_done()
+
+
+def flush_scraping_history() -> None:
+    """Wait until all queued scraping runs have been written to the database."""
+    if _history_thread is not None:
+        _history_queue.join()
+
+
 def record_scraping_run(run_id: str, search_config: Dict[str, Any], job_count: int, new_job_count: int) -> None:
     """
     Record a scraping run in the database.
     
+    The row is queued and written by a background thread, so the caller doesn't
+    wait for the commit; call flush_scraping_history to wait for pending writes.
+    
     Args:
         run_id: Unique identifier for the run
         search_config: Search configuration used for the run
         job_count: Total number of jobs fetched
         new_job_count: Number of new jobs added
     """
-    initialize_database()
+    global _history_thread
     
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    # Make sure the schema exists before the writer thread opens its own connection
+    _get_conn()
     
     timestamp = datetime.now().isoformat()
     
-    cursor.execute(
-        "INSERT INTO scraping_history (run_id, timestamp, search_config, job_count, new_job_count) VALUES (?, ?, ?, ?, ?)",
-        (run_id, timestamp, json.dumps(search_config), job_count, new_job_count)
-    )
+    # Serialize compactly here rather than in the writer, so the write transaction stays short
+    if orjson is not None:
+        search_config_json = orjson.dumps(search_config).decode("utf-8")
+    else:
+        search_config_json = json.dumps(search_config, separators=(",", ":"))
     
-    conn.commit()
-    conn.close()
+    with _history_lock:
+        if _history_thread is None:
+            _history_thread = threading.Thread(target=_history_writer, name="scraping_history_writer", daemon=True)
+            _history_thread.start()
+            atexit.register(flush_scraping_history)
+    
+    _history_queue.put((run_id, timestamp, search_config_json, job_count, new_job_count))
     
     logger.info(f"Recorded scraping run {run_id} with {job_count} total jobs and {new_job_count} new jobs")
 
@@ -232,31 +592,19 @@ def get_recent_job_stats(days: int = 7) -> Dict[str, Any]:
     Returns:
         Dictionary with statistics
     """
-    initialize_database()
+    # Include scraping runs still waiting in the background writer's queue
+    flush_scraping_history()
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = _get_conn()
     cursor = conn.cursor()
     
     # Calculate date threshold
-    threshold_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-    
-    # Get total jobs
-    cursor.execute("SELECT COUNT(*) FROM jobs")
-    total_jobs = cursor.fetchone()[0]
-    
-    # Get new jobs in time period
-    cursor.execute("SELECT COUNT(*) FROM jobs WHERE first_seen_date >= ?", (threshold_date,))
-    new_jobs = cursor.fetchone()[0]
-    
-    # Get processed jobs
-    cursor.execute("SELECT COUNT(*) FROM jobs WHERE is_processed = 1")
-    processed_jobs = cursor.fetchone()[0]
-    
-    # Get scraping runs in time period
-    cursor.execute("SELECT COUNT(*) FROM scraping_history WHERE timestamp >= ?", (threshold_date,))
-    scraping_runs = cursor.fetchone()[0]
+    threshold_date = date.today() - timedelta(days=days)
     
-    conn.close()
+    # Get total jobs, new jobs in time period, processed jobs and scraping runs
+    # in time period in a single round-trip
+    cursor.execute(_SQL_JOB_STATS, (_epoch_day(threshold_date), threshold_date.isoformat()))
+    total_jobs, new_jobs, processed_jobs, scraping_runs = cursor.fetchone()
     
     return {
         "total_jobs": total_jobs,
@@ -17,41 +17,66 @@ dotenv_path = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv(dotenv_path=dotenv_path)
 
 # Now import the rest of the modules
+import csv
 import json
 import time
-import logging
 import re
+import atexit
 import asyncio
+import hashlib
+import shelve
+import threading
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
+from functools import lru_cache, partial
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
+import aiohttp
 import anthropic
 
+try:
+    import orjson  # Optional: much faster JSON serialization
+except ImportError:
+    orjson = None
+
 # Import from other modules
 from config import (
     LLM_MODEL, LLM_PROVIDER, MAX_JOBS_TO_ANALYZE, MATCH_SCORE_THRESHOLD,
-    RESULTS_DIR, LOGS_DIR, DATA_DIR, CV_FILE_PATH
+    RESULTS_DIR, setup_logging, DATA_DIR, CV_FILE_PATH, LLM_CACHE_FILE, LLM_CACHE_SIMILARITY,
+    LLM_CACHE_TTL_DAYS, LLM_CACHE_NEAR_DUPLICATES,
+    LLM_MAX_CONCURRENT_REQUESTS, LLM_USE_BATCH_API, LLM_BATCH_MIN_JOBS, LLM_BATCH_TIMEOUT_MINUTES
 )
-from cv_parser import parse_markdown_cv, format_cv_for_prompt
+from cv_parser import load_cv_for_prompt
+from apify_scraper import write_json_file, load_jobs_file
+from job_database import get_job_id
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, "llm_analyzer.log")),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("llm_analyzer")
+logger = setup_logging("llm_analyzer", "llm_analyzer.log")
 
 # Prompt management for job analysis
 import json
 from pathlib import Path
 
+@lru_cache(maxsize=16)
+def _read_prompt_template(prompt_path, mtime):
+    """
+    Read the template from a prompt file, cached by path and modification time.
+    
+    Args:
+        prompt_path (str): Path of the prompt JSON file
+        mtime (float): Modification time of the file, so an edited file is read again
+        
+    Returns:
+        str: The prompt template text
+    """
+    with open(prompt_path, 'rb') as f:
+        return json.load(f).get("template", "")
+
+
 def load_prompt_template(prompt_name="job_analysis", prompt_dir=None):
     """
     Load a prompt template from a JSON file.
     
+    Templates are cached until their file changes, so repeated loads only stat the file.
+    
     Args:
         prompt_name (str): Name of the prompt file without extension
         prompt_dir (str, optional): Directory containing prompt templates
@@ -65,9 +90,7 @@ def load_prompt_template(prompt_name="job_analysis", prompt_dir=None):
     prompt_path = os.path.join(prompt_dir, f"{prompt_name}.json")
     
     try:
-        with open(prompt_path, 'r') as f:
-            prompt_data = json.load(f)
-            return prompt_data.get("template", "")
+        return _read_prompt_template(prompt_path, os.path.getmtime(prompt_path))
     except FileNotFoundError:
         logger.error(f"Prompt file not found: {prompt_path}")
         # Return a default template string if file not found
@@ -105,270 +128,773 @@ def get_job_analysis_prompt(prompt_name="job_analysis", custom_prompt=None):
         return load_prompt_template(prompt_name)
 
 
-def call_claude_api(prompt: str) -> str:
+# Number of CSV rows written between flushes to disk
+CSV_FLUSH_ROWS = 10
+
+# Placeholder splitting a prompt template into its static head and job-specific tail
+JOB_DESCRIPTION_PLACEHOLDER = "{job_description}"
+
+
+def build_prompt_parts(prompt_template: str, cv_text: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Split a prompt template around the job description, formatting the CV once.
+    
+    Everything before the job description (instructions and CV) is identical for
+    every job in a batch, so it becomes a content block marked for Anthropic prompt
+    caching: after the first call, later calls read it from the cache instead of
+    paying for it as fresh input tokens. The rest of the template is formatted once
+    as well, so each job only needs its description prepended to it.
+    
+    Args:
+        prompt_template: Prompt template with {candidate_cv} and (once) {job_description} placeholders
+        cv_text: Formatted CV text for the prompt
+        
+    Returns:
+        Tuple of (cached text block, text following the job description), the
+        latter None if the template has no {job_description} placeholder
+    """
+    head, placeholder, tail = prompt_template.partition(JOB_DESCRIPTION_PLACEHOLDER)
+    cv_block = {
+        "type": "text",
+        "text": head.format(candidate_cv=cv_text),
+        "cache_control": {"type": "ephemeral"}
+    }
+    return cv_block, tail.format(candidate_cv=cv_text) if placeholder else None
+
+
+def build_prompt_content(prompt_parts: Tuple[Dict[str, Any], Optional[str]],
+                         job_description: str) -> List[Dict[str, Any]]:
+    """
+    Build the message content for one job: the cached CV block followed by the job-specific text.
+    
+    Args:
+        prompt_parts: Result of build_prompt_parts
+        job_description: Description of the job to analyze
+        
+    Returns:
+        List of text content blocks
+    """
+    cv_block, job_suffix = prompt_parts
+    if job_suffix is None:
+        return [cv_block]
+    return [cv_block, {"type": "text", "text": job_description + job_suffix}]
+
+
+# API settings, resolved once at import (the .env file is loaded above)
+ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
+_USE_OPENROUTER = ANTHROPIC_API_KEY.startswith("sk-or-")  # OpenRouter keys start with sk-or-
+_OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+_OPENROUTER_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=300)
+_OPENROUTER_HEADERS = {
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {ANTHROPIC_API_KEY}"
+}
+
+# OpenRouter expects model IDs in the format 'provider/model_name'
+_OPENROUTER_DEFAULT_MODEL = "anthropic/claude-3-sonnet:20240229"
+_OPENROUTER_MODEL_MAP = {
+    "claude-3-opus-20240229": "anthropic/claude-3-opus:20240229",
+    "anthropic/claude-3-sonnet:20240229": "anthropic/claude-3-sonnet:20240229",
+}
+if LLM_PROVIDER == "openrouter":
+    _OPENROUTER_MODEL = _OPENROUTER_MODEL_MAP.get(LLM_MODEL, _OPENROUTER_DEFAULT_MODEL)
+    if _USE_OPENROUTER and LLM_MODEL not in _OPENROUTER_MODEL_MAP:
+        logger.warning(f"Unknown model ID format: {LLM_MODEL}, defaulting to Sonnet 3.7")
+else:
+    # Only used if an OpenRouter key is configured without the openrouter provider
+    _OPENROUTER_MODEL = _OPENROUTER_DEFAULT_MODEL
+
+# Model that actually answers the analysis calls, part of the response cache key
+_ANALYSIS_MODEL = _OPENROUTER_MODEL if _USE_OPENROUTER else LLM_MODEL
+
+# API clients, shared by all calls made from one event loop
+_api_clients: Dict[str, Any] = {}
+
+
+def _get_api_client(name: str) -> Any:
+    """
+    Get a shared API client for the running event loop, creating it on first use.
+    
+    Clients hold connection pools bound to the loop they were created in, so a new
+    set is created when called from another loop (e.g. a later asyncio.run).
+    
+    Args:
+        name: "anthropic" for the Anthropic client, "openrouter" for the HTTP session
+        
+    Returns:
+        anthropic.AsyncAnthropic client or aiohttp.ClientSession
+    """
+    loop = asyncio.get_running_loop()
+    if _api_clients.get('loop') is not loop:
+        _api_clients.clear()
+        _api_clients['loop'] = loop
+    if name not in _api_clients:
+        if name == "anthropic":
+            _api_clients[name] = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+        else:
+            # Keep-alive connections (one per concurrent request) are reused across the
+            # batch, so only the first requests pay for the TCP and TLS handshakes
+            connector = aiohttp.TCPConnector(
+                limit_per_host=LLM_MAX_CONCURRENT_REQUESTS, keepalive_timeout=60, ttl_dns_cache=300
+            )
+            _api_clients[name] = aiohttp.ClientSession(
+                connector=connector, headers=_OPENROUTER_HEADERS, timeout=_OPENROUTER_TIMEOUT
+            )
+    return _api_clients[name]
+
+
+async def close_api_clients() -> None:
+    """
+    Close the API clients of the running event loop, releasing their connections.
+    """
+    client = _api_clients.pop("anthropic", None)
+    if client is not None:
+        await client.close()
+    session = _api_clients.pop("openrouter", None)
+    if session is not None:
+        await session.close()
+
+
+async def _call_openrouter(prompt: Union[str, List[Dict[str, Any]]],
+                           scanner: Optional["ResponseTagScanner"] = None) -> str:
+    """
+    Call Claude through the OpenRouter API, streaming the response as server-sent events.
+    
+    Args:
+        prompt: The prompt to send, as a string or a list of content blocks
+        scanner: Scanner fed with the response text as it arrives
+        
+    Returns:
+        The text response from Claude
+    """
+    payload = {
+        "model": _OPENROUTER_MODEL,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 4000,
+        "stream": True
+    }
+    
+    async with _get_api_client("openrouter").post(_OPENROUTER_URL, json=payload) as response:
+        if response.status != 200:
+            logger.error(f"OpenRouter API error: {response.status} - {await response.text()}")
+            return f"Error: API returned status code {response.status}"
+        
+        chunks = []
+        async for line in response.content:
+            # Skip blank separators and keep-alive comments, stop at the end marker
+            if not line.startswith(b"data: "):
+                continue
+            data = line[6:].strip()
+            if data == b"[DONE]":
+                break
+            text = json.loads(data)["choices"][0]["delta"].get("content")
+            if text:
+                chunks.append(text)
+                if scanner:
+                    scanner.feed(text)
+    
+    logger.info("Successfully received response from OpenRouter API")
+    return "".join(chunks)
+
+
+async def _call_anthropic(prompt: Union[str, List[Dict[str, Any]]],
+                          scanner: Optional["ResponseTagScanner"] = None) -> str:
+    """
+    Call the Anthropic Claude API directly, streaming the response.
+    
+    Args:
+        prompt: The prompt to send, as a string or a list of content blocks
+        scanner: Scanner fed with the response text as it arrives
+        
+    Returns:
+        The text response from Claude
+    """
+    chunks = []
+    async with _get_api_client("anthropic").messages.stream(
+        model=LLM_MODEL,
+        max_tokens=4000,
+        messages=[
+            {"role": "user", "content": prompt}
+        ]
+    ) as stream:
+        async for text in stream.text_stream:
+            chunks.append(text)
+            if scanner:
+                scanner.feed(text)
+        message = await stream.get_final_message()
+    
+    cache_read_tokens = getattr(message.usage, "cache_read_input_tokens", None) or 0
+    logger.info(f"Successfully received response from Claude API (cached prompt tokens: {cache_read_tokens})")
+    return "".join(chunks)
+
+
+# API call for each value of _USE_OPENROUTER
+_DISPATCH = {True: _call_openrouter, False: _call_anthropic}
+
+
+async def call_claude_api(prompt: Union[str, List[Dict[str, Any]]],
+                          scanner: Optional["ResponseTagScanner"] = None) -> str:
     """
     Call the Anthropic Claude API with the given prompt.
     Uses OpenRouter API if using an OpenRouter API key (sk-or- prefix).
     
     Args:
-        prompt: The prompt to send to the Claude API
+        prompt: The prompt to send to the Claude API, either as a string or as a
+            list of content blocks (see build_prompt_content)
+        scanner: Scanner fed with the response text as it streams in, so its
+            sections are parsed by the time the call returns
         
     Returns:
         The text response from Claude
     """
+    if not ANTHROPIC_API_KEY:
+        logger.error("ANTHROPIC_API_KEY not found in environment variables")
+        return ""
+    
     try:
-        # Get API key from environment variables
-        api_key = os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            logger.error("ANTHROPIC_API_KEY not found in environment variables")
-            return ""
-        
-        # Check if using OpenRouter API (key starts with sk-or-)
-        if api_key.startswith("sk-or-"):
-            # Using OpenRouter API for Claude
-            import requests
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
-            
-            # Determine which model to use with OpenRouter - always use the proper format
-            # OpenRouter expects model IDs in the format 'provider/model_name'
-            if LLM_PROVIDER == "openrouter":
-                if LLM_MODEL == "claude-3-opus-20240229":
-                    openrouter_model = "anthropic/claude-3-opus:20240229"
-                elif LLM_MODEL == "anthropic/claude-3-sonnet:20240229":
-                    openrouter_model = "anthropic/claude-3-sonnet:20240229"
-                else:
-                    # Default to Sonnet if the model ID format is unknown
-                    openrouter_model = "anthropic/claude-3-sonnet:20240229"
-                    logger.warning(f"Unknown model ID format: {LLM_MODEL}, defaulting to Sonnet 3.7")
-            else:
-                # This shouldn't be reached as we're in the OpenRouter API path, but just in case
-                openrouter_model = "anthropic/claude-3-sonnet:20240229"
-                
-            payload = {
-                "model": openrouter_model,
+        return await _DISPATCH[_USE_OPENROUTER](prompt, scanner)
+    except Exception as e:
+        logger.error(f"Error calling Claude API: {str(e)}")
+        return f"Error: {str(e)}"
+
+
+def _description_digest(job_description: str) -> bytes:
+    """
+    Hash a job description to detect postings sharing the same text.
+    
+    Args:
+        job_description: Description of the job
+        
+    Returns:
+        16-byte blake2b digest of the stripped description
+    """
+    return hashlib.blake2b(job_description.strip().encode('utf-8'), digest_size=16).digest()
+
+
+def group_jobs_by_description(jobs: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Group jobs with identical descriptions, e.g. reposts or the same role listed by agencies.
+    
+    Args:
+        jobs: Jobs to group
+        
+    Returns:
+        Lists of indices into jobs, one list per distinct description in order of
+        first appearance; jobs without a description are left out
+    """
+    groups: Dict[bytes, List[int]] = {}
+    for index, job in enumerate(jobs):
+        if job.get('descriptionText'):
+            groups.setdefault(_description_digest(job['descriptionText']), []).append(index)
+    return list(groups.values())
+
+
+def _unique_description_jobs(jobs: List[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield the first job of each distinct description (see group_jobs_by_description).
+    
+    Args:
+        jobs: Jobs to scan
+        
+    Yields:
+        Tuples of (index into jobs, job)
+    """
+    for indices in group_jobs_by_description(jobs):
+        yield indices[0], jobs[indices[0]]
+
+
+async def fetch_batch_responses(jobs: List[Dict[str, Any]], prompt_parts: Tuple[Dict[str, Any], Optional[str]],
+                                cv_text: str, prompt_name: str) -> Dict[int, str]:
+    """
+    Analyze jobs through one Anthropic Message Batch instead of a request per job.
+    
+    Batched requests are billed at a discount and need a single submission, at the
+    cost of latency: results arrive when the whole batch has been processed, or not
+    at all if it runs past LLM_BATCH_TIMEOUT_MINUTES and is canceled. Jobs with a
+    cached analysis, and repeats of a description, are left out. Nothing is submitted
+    (and the caller falls back to one request per job) for OpenRouter keys or fewer
+    than LLM_BATCH_MIN_JOBS uncached jobs.
+    
+    Args:
+        jobs: Jobs to analyze
+        prompt_parts: Prompt shared by the batch, from build_prompt_parts
+        cv_text: Formatted CV text for the prompt
+        prompt_name: Name of the prompt template
+        
+    Returns:
+        Dictionary mapping the index of each job in jobs to its response text;
+        jobs whose request failed are missing
+    """
+    if not ANTHROPIC_API_KEY or _USE_OPENROUTER:
+        logger.info("Message Batches API needs a direct Anthropic API key, analyzing jobs one request each")
+        return {}
+    
+    # Look up the cached analyses in a worker thread, as they are read from disk
+    def uncached_jobs():
+        return [
+            (index, job) for index, job in _unique_description_jobs(jobs)
+            if not get_cached_analysis(job['descriptionText'], cv_text, prompt_name)
+        ]
+    
+    # custom_id must be short and alphanumeric, so jobs are identified by their position
+    requests = [
+        {
+            "custom_id": f"job-{index}",
+            "params": {
+                "model": LLM_MODEL,
+                "max_tokens": 4000,
                 "messages": [
-                    {"role": "user", "content": prompt}
-                ],
-                "max_tokens": 4000
-            }
-            
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                response_data = response.json()
-                response_text = response_data["choices"][0]["message"]["content"]
-                logger.info("Successfully received response from OpenRouter API")
-                return response_text
-            else:
-                logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
-                return f"Error: API returned status code {response.status_code}"
-        else:
-            # Using direct Anthropic API
-            client = anthropic.Anthropic(api_key=api_key)
-            
-            # Call the API
-            response = client.messages.create(
-                model=LLM_MODEL,
-                max_tokens=4000,
-                messages=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": build_prompt_content(prompt_parts, job['descriptionText'])}
                 ]
-            )
-            
-            # Extract the text from the response
-            response_text = response.content[0].text
-            logger.info("Successfully received response from Claude API")
-            return response_text
+            }
+        }
+        for index, job in await asyncio.get_running_loop().run_in_executor(None, uncached_jobs)
+    ]
+    if len(requests) < LLM_BATCH_MIN_JOBS:
+        return {}
     
+    responses = {}
+    try:
+        client = _get_api_client("anthropic")
+        batch = await client.messages.batches.create(requests=requests)
+        logger.info(f"Submitted message batch {batch.id} with {len(requests)} jobs")
+        
+        # Poll with exponential backoff until the batch has been processed, giving up
+        # (and leaving every job to the per-job requests) after LLM_BATCH_TIMEOUT_MINUTES
+        deadline = time.monotonic() + LLM_BATCH_TIMEOUT_MINUTES * 60
+        poll_delay = 5
+        while batch.processing_status != "ended":
+            if time.monotonic() >= deadline:
+                logger.warning(f"Message batch {batch.id} still running after {LLM_BATCH_TIMEOUT_MINUTES} minutes, "
+                               "canceling it and analyzing jobs one request each")
+                await client.messages.batches.cancel(batch.id)
+                return {}
+            await asyncio.sleep(poll_delay)
+            poll_delay = min(poll_delay * 1.5, 60)
+            batch = await client.messages.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            logger.info(f"Message batch {batch.id}: {counts.processing} processing, "
+                        f"{counts.succeeded} succeeded, {counts.errored} errored")
+        
+        # Results are streamed back as JSONL, one entry per request
+        async for entry in await client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                responses[int(entry.custom_id.split("-", 1)[1])] = entry.result.message.content[0].text
+            else:
+                logger.error(f"Message batch request {entry.custom_id} {entry.result.type}")
+        logger.info(f"Message batch {batch.id} ended with {len(responses)} successful responses")
     except Exception as e:
-        logger.error(f"Error calling Claude API: {str(e)}")
-        return f"Error: {str(e)}"
+        logger.error(f"Error running message batch: {str(e)}")
+    
+    return responses
 
 
-def extract_response_sections(response_text: str) -> Dict[str, str]:
+# Tagged sections of an LLM response, matched together in a single pass
+RESPONSE_TAGS = (
+    'score', 'human_fit', 'ats_fit', 'key_strengths', 'critical_gaps', 'cv_tailoring',
+    'experience_positioning', 'talking_points', 'recommendation', 'summary'
+)
+RESPONSE_TAG_RE = re.compile(r'<(' + '|'.join(RESPONSE_TAGS) + r')>\s*(.+?)\s*</\1>', re.DOTALL)
+NUM_RE = re.compile(r'(\d+(?:\.\d+)?)')
+
+# Free-text sections copied from the response as-is
+TEXT_SECTIONS = ('key_strengths', 'critical_gaps', 'cv_tailoring', 'experience_positioning', 'talking_points')
+
+# Recommendation codes; the first one mentioned in the recommendation is used
+RECOMMENDATION_CODE_RE = re.compile(r'\b(PURSUE|CONSIDER|AVOID)\b', re.IGNORECASE)
+
+
+def _extract_fit_score(content: Optional[str]) -> Tuple[float, str]:
     """
-    Extract structured sections from the LLM response.
+    Get the numeric score and full text of a fit section.
     
     Args:
-        response_text: The raw response from the LLM
+        content: Text of the fit section, or None if the section is missing
         
     Returns:
-        Dictionary with extracted sections from the enhanced job analysis
+        Tuple of (score, text), (0.0, "") if the section is missing
     """
-    sections = {}
+    if content is None:
+        return 0.0, ""
     
-    # Extract main score (for backward compatibility)
-    score_match = re.search(r'<score>(\d+(?:\.\d+)?)</score>', response_text)
-    if score_match:
+    # Try to extract the numeric score from the text
+    score_in_text = NUM_RE.search(content)
+    if score_in_text:
         try:
-            score = float(score_match.group(1))
-            sections['score'] = score
+            return float(score_in_text.group(1)), content
         except ValueError:
-            sections['score'] = 0.0
-    else:
-        sections['score'] = 0.0
-    
-    # Extract human fit score
-    human_fit_match = re.search(r'<human_fit>\s*(.+?)\s*</human_fit>', response_text, re.DOTALL)
-    if human_fit_match:
-        content = human_fit_match.group(1).strip()
-        # Try to extract the numeric score from the text
-        score_in_text = re.search(r'(\d+(?:\.\d+)?)', content)
-        if score_in_text:
-            try:
-                sections['human_fit'] = float(score_in_text.group(1))
-            except ValueError:
-                sections['human_fit'] = 0.0
-        else:
-            sections['human_fit'] = 0.0
-        sections['human_fit_text'] = content
-    else:
-        sections['human_fit'] = 0.0
-        sections['human_fit_text'] = ""
-    
-    # Extract ATS fit score
-    ats_fit_match = re.search(r'<ats_fit>\s*(.+?)\s*</ats_fit>', response_text, re.DOTALL)
-    if ats_fit_match:
-        content = ats_fit_match.group(1).strip()
-        # Try to extract the numeric score from the text
-        score_in_text = re.search(r'(\d+(?:\.\d+)?)', content)
-        if score_in_text:
-            try:
-                sections['ats_fit'] = float(score_in_text.group(1))
-            except ValueError:
-                sections['ats_fit'] = 0.0
-        else:
-            sections['ats_fit'] = 0.0
-        sections['ats_fit_text'] = content
-    else:
-        sections['ats_fit'] = 0.0
-        sections['ats_fit_text'] = ""
+            pass
+    return 0.0, content
+
+
+class ResponseTagScanner:
+    """
+    Incremental extractor of the tagged sections of an LLM response.
     
-    # Extract key strengths
-    key_strengths_match = re.search(r'<key_strengths>\s*(.+?)\s*</key_strengths>', response_text, re.DOTALL)
-    if key_strengths_match:
-        sections['key_strengths'] = key_strengths_match.group(1).strip()
-    else:
-        sections['key_strengths'] = ""
+    Text is fed as it streams in. Each section is committed as soon as its closing
+    tag arrives, and later scans start after the last committed section, so the
+    response is parsed while it is still being received.
+    """
     
-    # Extract critical gaps
-    critical_gaps_match = re.search(r'<critical_gaps>\s*(.+?)\s*</critical_gaps>', response_text, re.DOTALL)
-    if critical_gaps_match:
-        sections['critical_gaps'] = critical_gaps_match.group(1).strip()
-    else:
-        sections['critical_gaps'] = ""
+    def __init__(self):
+        self._text = ""
+        self._offset = 0
+        self.tag_text: Dict[str, str] = {}
     
-    # Extract CV tailoring
-    cv_tailoring_match = re.search(r'<cv_tailoring>\s*(.+?)\s*</cv_tailoring>', response_text, re.DOTALL)
-    if cv_tailoring_match:
-        sections['cv_tailoring'] = cv_tailoring_match.group(1).strip()
-    else:
-        sections['cv_tailoring'] = ""
+    def feed(self, chunk: str) -> None:
+        """
+        Add received text and commit the sections it completes.
+        
+        Args:
+            chunk: Next piece of the response text
+        """
+        self._text += chunk
+        # A section can only be completed by the '>' of its closing tag
+        if '>' not in chunk:
+            return
+        for match in RESPONSE_TAG_RE.finditer(self._text, self._offset):
+            # If a tag appears more than once, its first occurrence is used
+            self.tag_text.setdefault(match.group(1), match.group(2).strip())
+            self._offset = match.end()
+    
+    def sections(self) -> Dict[str, Any]:
+        """
+        Build the sections dictionary from the tags committed so far.
+        
+        Returns:
+            Dictionary with extracted sections (see extract_response_sections)
+        """
+        return _build_sections(self.tag_text)
+
+
+def extract_response_sections(response_text: str) -> Dict[str, str]:
+    """
+    Extract structured sections from the LLM response.
     
-    # Extract experience positioning
-    experience_positioning_match = re.search(r'<experience_positioning>\s*(.+?)\s*</experience_positioning>', response_text, re.DOTALL)
-    if experience_positioning_match:
-        sections['experience_positioning'] = experience_positioning_match.group(1).strip()
-    else:
-        sections['experience_positioning'] = ""
+    All tags are found in one scan of the response; if a tag appears more than
+    once, its first occurrence is used.
     
-    # Extract talking points
-    talking_points_match = re.search(r'<talking_points>\s*(.+?)\s*</talking_points>', response_text, re.DOTALL)
-    if talking_points_match:
-        sections['talking_points'] = talking_points_match.group(1).strip()
-    else:
-        sections['talking_points'] = ""
+    Args:
+        response_text: The raw response from the LLM
+        
+    Returns:
+        Dictionary with extracted sections from the enhanced job analysis
+    """
+    scanner = ResponseTagScanner()
+    scanner.feed(response_text)
+    return scanner.sections()
+
+
+def _build_sections(tag_text: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Convert the text of each response tag into the sections dictionary.
+    
+    Args:
+        tag_text: Stripped text of each tag found in the response
+        
+    Returns:
+        Dictionary with extracted sections from the enhanced job analysis
+    """
+    sections = {}
+    
+    # Extract main score (for backward compatibility); the tag must hold just the number
+    score_match = NUM_RE.fullmatch(tag_text.get('score', ''))
+    sections['score'] = float(score_match.group(1)) if score_match else 0.0
+    
+    # Extract human fit and ATS fit scores
+    sections['human_fit'], sections['human_fit_text'] = _extract_fit_score(tag_text.get('human_fit'))
+    sections['ats_fit'], sections['ats_fit_text'] = _extract_fit_score(tag_text.get('ats_fit'))
+    
+    # Extract key strengths, critical gaps, CV tailoring, experience positioning and talking points
+    for key in TEXT_SECTIONS:
+        sections[key] = tag_text.get(key, "")
     
     # Extract recommendation
-    recommendation_match = re.search(r'<recommendation>\s*(.+?)\s*</recommendation>', response_text, re.DOTALL)
-    if recommendation_match:
-        recommendation_text = recommendation_match.group(1).strip()
+    recommendation_text = tag_text.get('recommendation')
+    if recommendation_text is not None:
         sections['recommendation'] = recommendation_text
         
         # Extract recommendation code (PURSUE, CONSIDER, AVOID)
-        if recommendation_text.upper().startswith('PURSUE'):
-            sections['recommendation_code'] = 'PURSUE'
-        elif recommendation_text.upper().startswith('CONSIDER'):
-            sections['recommendation_code'] = 'CONSIDER'
-        elif recommendation_text.upper().startswith('AVOID'):
-            sections['recommendation_code'] = 'AVOID'
-        else:
-            # Try to find these keywords anywhere in the text
-            if 'PURSUE' in recommendation_text.upper():
-                sections['recommendation_code'] = 'PURSUE'
-            elif 'CONSIDER' in recommendation_text.upper():
-                sections['recommendation_code'] = 'CONSIDER'
-            elif 'AVOID' in recommendation_text.upper():
-                sections['recommendation_code'] = 'AVOID'
-            else:
-                sections['recommendation_code'] = 'REVIEW'
+        code_match = RECOMMENDATION_CODE_RE.search(recommendation_text)
+        sections['recommendation_code'] = code_match.group(1).upper() if code_match else 'REVIEW'
     else:
         sections['recommendation'] = ""
         sections['recommendation_code'] = "REVIEW"
     
     # Extract summary
-    summary_match = re.search(r'<summary>\s*(.+?)\s*</summary>', response_text, re.DOTALL)
-    if summary_match:
-        sections['summary'] = summary_match.group(1).strip()
-    else:
-        sections['summary'] = ""
+    sections['summary'] = tag_text.get('summary', "")
     
     return sections
 
 
-def prefilter_jobs(jobs: List[Dict[str, Any]], max_jobs: int = MAX_JOBS_TO_ANALYZE) -> List[Dict[str, Any]]:
+# Response cache state: the on-disk store is opened on first use; the shingle sets of
+# descriptions seen in this process back the optional near-duplicate lookup
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+_description_shingles: Dict[str, List[Tuple[frozenset, str]]] = {}
+
+# Age in seconds after which a stored analysis is discarded
+_LLM_CACHE_TTL_SECONDS = LLM_CACHE_TTL_DAYS * 86400
+
+
+def _is_expired(entry: Dict[str, Any]) -> bool:
+    """
+    Check whether a stored analysis is older than LLM_CACHE_TTL_DAYS.
+    
+    Args:
+        entry: Cache entry written by store_cached_analysis
+        
+    Returns:
+        True if the entry has expired (entries without a timestamp always have)
+    """
+    return time.time() - entry.get('stored_at', 0) > _LLM_CACHE_TTL_SECONDS
+
+
+def _get_llm_cache() -> shelve.Shelf:
+    """
+    Get the persistent LLM response cache, opening it on first use.
+    
+    Expired entries are dropped when the cache is opened, so the file doesn't
+    grow without bound.
+    
+    Returns:
+        Shelf stored at LLM_CACHE_FILE
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = shelve.open(LLM_CACHE_FILE)
+        atexit.register(_llm_cache.close)
+        expired = [key for key in _llm_cache if _is_expired(_llm_cache[key])]
+        for key in expired:
+            del _llm_cache[key]
+        if expired:
+            logger.info(f"Removed {len(expired)} expired analyses from LLM cache")
+    return _llm_cache
+
+
+def _llm_cache_context(cv_text: str, prompt_name: str) -> str:
+    """
+    Identify the CV, prompt and model an analysis was made with.
+    
+    Args:
+        cv_text: Formatted CV text for the prompt
+        prompt_name: Name of the prompt template
+        
+    Returns:
+        Hash of the CV text followed by the prompt name and model
+    """
+    return hashlib.sha256(cv_text.encode('utf-8')).hexdigest() + prompt_name + _ANALYSIS_MODEL
+
+
+def _description_key(job_description: str, context: str) -> str:
+    """
+    Build the cache key of a job description analyzed in the given context.
+    
+    Args:
+        job_description: Description of the job
+        context: Result of _llm_cache_context
+        
+    Returns:
+        SHA-256 hex digest of the description followed by the context
+    """
+    return hashlib.sha256(job_description.strip().encode('utf-8')).hexdigest() + context
+
+
+def _shingles(text: str, size: int = 5) -> frozenset:
+    """
+    Split a text into its set of overlapping word n-grams.
+    
+    Args:
+        text: Text to split
+        size: Number of words per shingle
+        
+    Returns:
+        Frozen set of word tuples
+    """
+    words = text.lower().split()
+    return frozenset(tuple(words[i:i + size]) for i in range(max(len(words) - size + 1, 1)))
+
+
+def get_cached_analysis(job_description: str, cv_text: str, prompt_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a stored analysis of the same job description.
+    
+    Only exact repeats analyzed with the same CV and prompt within LLM_CACHE_TTL_DAYS
+    are reused. With LLM_CACHE_NEAR_DUPLICATES enabled, descriptions seen in this run
+    whose word shingles have a Jaccard similarity of at least LLM_CACHE_SIMILARITY
+    match too. Reads the shelve file, so call it from a worker thread in async code.
+    
+    Args:
+        job_description: Description of the job to analyze
+        cv_text: Formatted CV text for the prompt
+        prompt_name: Name of the prompt template
+        
+    Returns:
+        Dictionary with 'response_text' and parsed 'sections', or None on a miss
+    """
+    context = _llm_cache_context(cv_text, prompt_name)
+    with _llm_cache_lock:
+        cache = _get_llm_cache()
+        entry = cache.get(_description_key(job_description, context))
+        if entry is not None and not _is_expired(entry):
+            return entry
+        
+        if LLM_CACHE_NEAR_DUPLICATES:
+            shingles = _shingles(job_description)
+            for seen_shingles, seen_key in _description_shingles.get(context, []):
+                union = len(shingles | seen_shingles)
+                if union and len(shingles & seen_shingles) / union >= LLM_CACHE_SIMILARITY:
+                    entry = cache.get(seen_key)
+                    if entry is not None:
+                        return entry
+    return None
+
+
+def store_cached_analysis(job_description: str, cv_text: str, prompt_name: str,
+                          response_text: str, sections: Dict[str, Any]) -> None:
+    """
+    Store an analysis so repeats of the job description skip the LLM call.
+    
+    Writes the shelve file, so call it from a worker thread in async code.
+    
+    Args:
+        job_description: Description of the analyzed job
+        cv_text: Formatted CV text for the prompt
+        prompt_name: Name of the prompt template
+        response_text: Raw LLM response
+        sections: Sections parsed from the response by extract_response_sections
+    """
+    context = _llm_cache_context(cv_text, prompt_name)
+    key = _description_key(job_description, context)
+    with _llm_cache_lock:
+        try:
+            _get_llm_cache()[key] = {'response_text': response_text, 'sections': sections, 'stored_at': time.time()}
+        except Exception as e:
+            logger.error(f"Error storing analysis in LLM cache: {str(e)}")
+            return
+        if LLM_CACHE_NEAR_DUPLICATES:
+            _description_shingles.setdefault(context, []).append((_shingles(job_description), key))
+
+
+# Fields of an analysis result, in output order: (result key, default) for the sections
+# parsed from the response, (result key, job key) for data copied from the scraped job
+RESULT_SECTION_FIELDS = (
+    ('human_fit', 0.0), ('human_fit_text', ''), ('ats_fit', 0.0), ('ats_fit_text', ''),
+    ('key_strengths', ''), ('critical_gaps', ''), ('cv_tailoring', ''), ('experience_positioning', ''),
+    ('talking_points', ''), ('recommendation', ''), ('recommendation_code', 'REVIEW'), ('summary', '')
+)
+RESULT_JOB_FIELDS = (
+    ('location', 'location'), ('seniority_level', 'seniorityLevel'), ('employment_type', 'employmentType'),
+    ('job_function', 'jobFunction'), ('industries', 'industries'), ('posted_at', 'postedAt'),
+    ('company_website', 'companyWebsite'), ('company_linkedin', 'companyLinkedinUrl'),
+    ('description', 'descriptionText')
+)
+
+# Columns of the CSV output: (header, result key, default)
+CSV_COLUMNS = (
+    ('Job Title', 'job_title', ''), ('Company', 'company', ''), ('Location', 'location', ''),
+    ('Match Score', 'match_score', 0), ('Human Fit', 'human_fit', 0), ('ATS Fit', 'ats_fit', 0),
+    ('Key Strengths', 'key_strengths', ''), ('Critical Gaps', 'critical_gaps', ''),
+    ('Recommendation Code', 'recommendation_code', ''), ('Recommendation', 'recommendation', ''),
+    ('URL', 'url', '')
+)
+
+
+def dumps_json_line(data: Any) -> bytes:
+    """
+    Serialize data as one line of a JSON Lines file, using orjson when it is installed.
+    
+    Args:
+        data: JSON-serializable data
+        
+    Returns:
+        Encoded JSON document followed by a newline
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+@lru_cache(maxsize=1)
+def _load_tfidf() -> Optional[Tuple[Any, Any]]:
+    """
+    Import numpy and scikit-learn's TfidfVectorizer on first use.
+    
+    scikit-learn takes about a second to import, so it is loaded only when jobs are
+    actually ranked, not by every script that imports this module.
+    
+    Returns:
+        Tuple of the numpy module and TfidfVectorizer, or None if scikit-learn is not installed
+    """
+    try:
+        import numpy as np  # Optional: rank jobs by TF-IDF similarity to the CV when prefiltering
+        from sklearn.feature_extraction.text import TfidfVectorizer
+    except ImportError:
+        return None
+    return np, TfidfVectorizer
+
+
+def prefilter_jobs(jobs: List[Dict[str, Any]], max_jobs: int = MAX_JOBS_TO_ANALYZE,
+                   cv_text: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Prefilter jobs to select the most promising ones for detailed LLM analysis.
     
+    When the CV text is given (and scikit-learn is installed), jobs are ranked by
+    the TF-IDF cosine similarity of their description to the CV, computed for all
+    jobs with one sparse matrix product.
+    
     Args:
         jobs: List of job dictionaries from the Apify scraper
         max_jobs: Maximum number of jobs to analyze (to control API costs)
+        cv_text: Formatted CV text to rank the jobs against
         
     Returns:
-        Filtered list of jobs for LLM analysis
+        Filtered list of jobs for LLM analysis, most relevant first
     """
     logger.info(f"Prefiltering {len(jobs)} jobs to select top {max_jobs} for analysis")
     
-    # Apply basic filtering criteria
+    # Skip jobs without descriptions
     filtered_jobs = []
-    
     for job in jobs:
-        # Skip jobs without descriptions
         if not job.get('descriptionText'):
             logger.debug(f"Skipping job with no description: {job.get('title', 'No title')}")
             continue
-        
-        # Calculate a basic relevance score based on job title and description
-        # This is a placeholder for more sophisticated scoring in the future
-        relevance_score = 1  # Set a default non-zero score to ensure jobs get selected
-        
-        # Additional filtering logic could be added here, such as:
-        # - Keyword matching based on the CV's skills and experience
-        # - Role title matching
-        # - Company reputation or industry relevance
-        # - Location preference matching
-        
-        job['relevance_score'] = relevance_score
         filtered_jobs.append(job)
     
-    # Sort by relevance score and limit to max_jobs
-    filtered_jobs.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-    
-    # Always return at least some jobs if available, even if relevance scores are all the same
-    result = filtered_jobs[:max_jobs]
+    tfidf = _load_tfidf() if cv_text and filtered_jobs else None
+    if tfidf is not None:
+        np, TfidfVectorizer = tfidf
+        
+        # TF-IDF rows are L2-normalized, so their dot product is the cosine similarity
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2))
+        matrix = vectorizer.fit_transform([cv_text] + [job['descriptionText'] for job in filtered_jobs])
+        similarities = (matrix[1:] @ matrix[0].T).toarray().ravel()
+        for job, similarity in zip(filtered_jobs, similarities):
+            job['relevance_score'] = float(similarity)
+        
+        # Select the top jobs in linear time, then sort only those
+        if 0 < max_jobs < len(filtered_jobs):
+            top_indices = np.argpartition(-similarities, max_jobs - 1)[:max_jobs]
+        else:
+            top_indices = np.arange(len(filtered_jobs))
+        result = [filtered_jobs[i] for i in top_indices[np.argsort(-similarities[top_indices], kind='stable')]]
+        result = result[:max(max_jobs, 0)]
+    else:
+        # Without a CV to rank against, every job scores the same
+        for job in filtered_jobs:
+            job['relevance_score'] = 1
+        result = filtered_jobs[:max(max_jobs, 0)]
     
     logger.info(f"Selected {len(result)} jobs for LLM analysis")
     return result
 
 
-async def analyze_job(job: Dict[str, Any], cv_text: str, output_dir: Path, prompt_name: str = "job_analysis") -> Dict[str, Any]:
+async def analyze_job(job: Dict[str, Any], cv_text: str, output_dir: Path, prompt_name: str = "job_analysis",
+                      prompt_parts: Optional[Tuple[Dict[str, Any], Optional[str]]] = None,
+                      semaphore: Optional[asyncio.Semaphore] = None,
+                      response_text: Optional[str] = None) -> Dict[str, Any]:
     """
     Analyze a single job against the candidate's CV using the LLM.
     
@@ -377,13 +903,16 @@ async def analyze_job(job: Dict[str, Any], cv_text: str, output_dir: Path, promp
         cv_text: Formatted CV text for the prompt
         output_dir: Directory to save analysis results
         prompt_name: Name of the prompt template to use
+        prompt_parts: Prompt shared by a batch, from build_prompt_parts (built here if not given)
+        semaphore: Semaphore bounding the number of concurrent LLM calls of a batch
+        response_text: Response already fetched for this job (see fetch_batch_responses)
         
     Returns:
         Dictionary with analysis results
     """
     job_title = job.get('title', 'Unknown Title')
     company = job.get('companyName', 'Unknown Company')
-    job_id = job.get('id', str(int(time.time())))
+    job_id = get_job_id(job)
     logger.info(f"Analyzing job: {job_title} at {company} (ID: {job_id}) using prompt: {prompt_name}")
     
     # Prepare job description and clean it if necessary
@@ -392,21 +921,42 @@ async def analyze_job(job: Dict[str, Any], cv_text: str, output_dir: Path, promp
         logger.warning(f"Job {job_id} has no description, skipping analysis")
         return None
     
-    # Get prompt template and format it
-    prompt_template = get_job_analysis_prompt(prompt_name)
-    prompt = prompt_template.format(
-        candidate_cv=cv_text,
-        job_description=job_description
-    )
-    
-    # Call LLM API
-    response_text = call_claude_api(prompt)
-    if not response_text or response_text.startswith("Error"):
-        logger.error(f"Failed to get analysis for job {job_id}")
-        return None
+    # Get prompt template and build the prompt behind the cached CV block
+    if prompt_parts is None:
+        prompt_parts = build_prompt_parts(get_job_analysis_prompt(prompt_name), cv_text)
+    prompt = build_prompt_content(prompt_parts, job_description)
+    
+    # Reuse the analysis of a repeated description, otherwise call the LLM API
+    # unless the response was already fetched
+    loop = asyncio.get_running_loop()
+    cached = None
+    if response_text is None:
+        cached = await loop.run_in_executor(None, get_cached_analysis, job_description, cv_text, prompt_name)
+    if cached:
+        logger.info(f"Using cached analysis for job {job_id}")
+        response_text = cached['response_text']
+        extracted = cached['sections']
+    else:
+        # Streamed responses are parsed as they arrive; a prefetched one is parsed here
+        scanner = ResponseTagScanner()
+        if response_text is None:
+            if semaphore:
+                async with semaphore:
+                    response_text = await call_claude_api(prompt, scanner)
+            else:
+                response_text = await call_claude_api(prompt, scanner)
+        else:
+            scanner.feed(response_text)
+        if not response_text or response_text.startswith("Error"):
+            logger.error(f"Failed to get analysis for job {job_id}")
+            return None
+        
+        # Extract structured data from response
+        extracted = scanner.sections()
+        await loop.run_in_executor(
+            None, store_cached_analysis, job_description, cv_text, prompt_name, response_text, extracted
+        )
     
-    # Extract structured data from response
-    extracted = extract_response_sections(response_text)
     match_score = extracted.get('score', 0.0)
     
     # Create results dictionary with all job data
@@ -418,18 +968,7 @@ async def analyze_job(job: Dict[str, Any], cv_text: str, output_dir: Path, promp
         'match_score': match_score,
         
         # Enhanced analysis results
-        'human_fit': extracted.get('human_fit', 0.0),
-        'human_fit_text': extracted.get('human_fit_text', ''),
-        'ats_fit': extracted.get('ats_fit', 0.0),
-        'ats_fit_text': extracted.get('ats_fit_text', ''),
-        'key_strengths': extracted.get('key_strengths', ''),
-        'critical_gaps': extracted.get('critical_gaps', ''),
-        'cv_tailoring': extracted.get('cv_tailoring', ''),
-        'experience_positioning': extracted.get('experience_positioning', ''),
-        'talking_points': extracted.get('talking_points', ''),
-        'recommendation': extracted.get('recommendation', ''),
-        'recommendation_code': extracted.get('recommendation_code', 'REVIEW'),
-        'summary': extracted.get('summary', ''),
+        **{key: extracted.get(key, default) for key, default in RESULT_SECTION_FIELDS},
         'response_text': response_text,
         
         # Use the correct 'link' field for job URL
@@ -437,31 +976,23 @@ async def analyze_job(job: Dict[str, Any], cv_text: str, output_dir: Path, promp
         'timestamp': datetime.now().isoformat(),
         
         # Additional job data
-        'location': job.get('location', ''),
-        'seniority_level': job.get('seniorityLevel', ''),
-        'employment_type': job.get('employmentType', ''),
-        'job_function': job.get('jobFunction', ''),
-        'industries': job.get('industries', ''),
-        'posted_at': job.get('postedAt', ''),
-        'company_website': job.get('companyWebsite', ''),
-        'company_linkedin': job.get('companyLinkedinUrl', ''),
-        'description': job.get('descriptionText', ''),
+        **{key: job.get(source, '') for key, source in RESULT_JOB_FIELDS},
         'salary': ', '.join(salary for salary in job.get('salaryInfo', []) if salary)
     }
     
-    # Save detailed analysis to file
+    # Save detailed analysis to file (compact, these files are only read by tools)
     os.makedirs(output_dir, exist_ok=True)
-    analysis_file = output_dir / f"job_{job_id}_analysis.json"
-    
-    with open(analysis_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    # Jobs without an ID get a timestamped file name, but keep an empty job_id
+    write_json_file(output_dir / f"job_{job_id or int(time.time())}_analysis.json", result)
     
     logger.info(f"Job {job_id} analysis complete. Match score: {match_score}/10")
     return result
 
 
 async def analyze_jobs_batch(jobs: List[Dict[str, Any]], cv_file_path: str = CV_FILE_PATH, 
-                       prompt_name: str = "job_analysis", csv_output_file: str = None) -> List[Dict[str, Any]]:
+                       prompt_name: str = "job_analysis", csv_output_file: str = None,
+                       use_batch_api: bool = LLM_USE_BATCH_API,
+                       max_jobs: int = MAX_JOBS_TO_ANALYZE) -> List[Dict[str, Any]]:
     """
     Analyze a batch of jobs against the candidate's CV using the LLM in parallel.
     
@@ -470,93 +1001,122 @@ async def analyze_jobs_batch(jobs: List[Dict[str, Any]], cv_file_path: str = CV_
         cv_file_path: Path to the Markdown CV file
         prompt_name: Name of the prompt template to use
         csv_output_file: Path to CSV file for incremental results output
+        use_batch_api: Submit the jobs as one Anthropic Message Batch (see fetch_batch_responses)
+        max_jobs: Maximum number of jobs kept by prefilter_jobs for analysis
         
     Returns:
         List of dictionaries with analysis results
     """
     logger.info(f"Starting analysis of {len(jobs)} jobs using prompt: {prompt_name}")
     
-    # Create output directory for analysis results
+    # Create the output directory, load and format the CV and load the prompt template
+    # concurrently in worker threads, as none of them depends on the others
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_dir = Path(RESULTS_DIR) / f"analysis_{timestamp}"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Load and format CV
-    try:
-        cv_data = parse_markdown_cv(cv_file_path)
-        cv_text = format_cv_for_prompt(cv_data)
-        logger.info(f"Successfully parsed CV from {cv_file_path}")
-    except Exception as e:
-        logger.error(f"Failed to parse CV: {str(e)}")
+    loop = asyncio.get_running_loop()
+    dir_result, cv_text, prompt_template = await asyncio.gather(
+        loop.run_in_executor(None, partial(os.makedirs, output_dir, exist_ok=True)),
+        loop.run_in_executor(None, load_cv_for_prompt, cv_file_path),
+        loop.run_in_executor(None, get_job_analysis_prompt, prompt_name),
+        return_exceptions=True
+    )
+    if isinstance(dir_result, Exception):
+        raise dir_result
+    if isinstance(cv_text, Exception):
+        logger.error(f"Failed to parse CV: {str(cv_text)}")
         return []
+    logger.info(f"Successfully parsed CV from {cv_file_path}")
+    
+    # Format the CV into the template once; every job then sends the identical cacheable block
+    prompt_parts = build_prompt_parts(prompt_template, cv_text)
     
     # Prefilter jobs to select the most promising ones
-    filtered_jobs = prefilter_jobs(jobs)
+    filtered_jobs = prefilter_jobs(jobs, max_jobs=max_jobs, cv_text=cv_text)
+    
+    # Fetch the responses through the Message Batches API if enabled; jobs without
+    # a batch response are analyzed one request each below
+    batch_responses = {}
+    if use_batch_api:
+        batch_responses = await fetch_batch_responses(filtered_jobs, prompt_parts, cv_text, prompt_name)
     
-    # Create the CSV file and write headers if specified
-    csv_lock = asyncio.Lock()  # Lock for thread-safe CSV writing
-    if csv_output_file:
+    # Rows for the CSV file, written by a single consumer that keeps the file open
+    csv_queue = asyncio.Queue()
+    
+    async def write_csv_rows():
         with open(csv_output_file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow([
-                'Job Title', 'Company', 'Location', 'Match Score', 'Human Fit', 'ATS Fit',
-                'Key Strengths', 'Critical Gaps', 'Recommendation Code', 'Recommendation', 'URL'
-            ])
-        logger.info(f"Created CSV output file: {csv_output_file}")
-    
-    # Define a callback function to write results to CSV as they complete
+            writer.writerow([header for header, _, _ in CSV_COLUMNS])
+            logger.info(f"Created CSV output file: {csv_output_file}")
+            
+            rows_written = 0
+            while True:
+                row = await csv_queue.get()
+                if row is None:
+                    break
+                writer.writerow(row)
+                rows_written += 1
+                # Flush periodically so the file still fills in while the batch runs
+                if rows_written % CSV_FLUSH_ROWS == 0:
+                    f.flush()
+    
+    csv_writer_task = asyncio.create_task(write_csv_rows()) if csv_output_file else None
+    
+    # Aggregate results, appended one JSON line per job as it completes
+    aggregate_file = open(output_dir / "aggregate_results.jsonl", 'wb')
+    
+    # Define a callback function to record results as they complete
     async def process_completed_job(task):
         result = await task
         if not result:
             return None
         
+        aggregate_file.write(dumps_json_line(result))
+        
         # Write to CSV if file is specified and match score meets threshold
-        if csv_output_file and result.get('match_score', 0) >= MATCH_SCORE_THRESHOLD:
-            async with csv_lock:  # Ensure thread-safe file writing
-                with open(csv_output_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        result.get('job_title', ''),
-                        result.get('company', ''),
-                        result.get('location', ''),
-                        result.get('match_score', 0),
-                        result.get('human_fit', 0),
-                        result.get('ats_fit', 0),
-                        result.get('key_strengths', ''),
-                        result.get('critical_gaps', ''),
-                        result.get('recommendation_code', ''),
-                        result.get('recommendation', ''),
-                        result.get('url', '')
-                    ])
-                    logger.info(f"Added job {result.get('job_id')} to CSV with match score: {result.get('match_score')}/10")
+        if csv_writer_task and result.get('match_score', 0) >= MATCH_SCORE_THRESHOLD:
+            await csv_queue.put([result.get(key, default) for _, key, default in CSV_COLUMNS])
+            logger.info(f"Added job {result.get('job_id')} to CSV with match score: {result.get('match_score')}/10")
         
         return result
     
-    # Create analysis tasks
-    tasks = []
-    for job in filtered_jobs:
-        task = analyze_job(job, cv_text, output_dir, prompt_name)
-        tasks.append(task)
-    
-    # Process tasks as they complete and write incremental results
-    pending = [asyncio.create_task(process_completed_job(task)) for task in tasks]
+    # The semaphore bounds how many LLM calls are in flight at once
+    semaphore = asyncio.BoundedSemaphore(LLM_MAX_CONCURRENT_REQUESTS)
+    
+    # Analyze each distinct description once; jobs repeating it reuse the response
+    # of the first job, with their own job data in the result
+    async def analyze_group(indices):
+        first = filtered_jobs[indices[0]]
+        first_result = await process_completed_job(
+            analyze_job(first, cv_text, output_dir, prompt_name, prompt_parts, semaphore, batch_responses.get(indices[0]))
+        )
+        group_results = [first_result]
+        for index in indices[1:]:
+            shared_response = first_result['response_text'] if first_result else batch_responses.get(index)
+            group_results.append(await process_completed_job(
+                analyze_job(filtered_jobs[index], cv_text, output_dir, prompt_name, prompt_parts, semaphore, shared_response)
+            ))
+        return group_results
+    
+    groups = group_jobs_by_description(filtered_jobs)
+    if len(groups) < len(filtered_jobs):
+        logger.info(f"Analyzing {len(groups)} distinct descriptions for {len(filtered_jobs)} jobs")
+    
+    # Run all groups concurrently, writing incremental results as each job completes
     results = []
-    
-    while pending:
-        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
-        for task in done:
-            result = task.result()
-            if result:
-                results.append(result)
-    
-    # Save aggregate results
-    aggregate_file = output_dir / "aggregate_results.json"
-    with open(aggregate_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'timestamp': datetime.now().isoformat(),
-            'total_jobs_analyzed': len(results),
-            'results': results
-        }, f, indent=2, ensure_ascii=False)
+    try:
+        completed = await asyncio.gather(*(analyze_group(indices) for indices in groups), return_exceptions=True)
+        for indices, group_results in zip(groups, completed):
+            if isinstance(group_results, Exception):
+                logger.error(f"Error analyzing job {filtered_jobs[indices[0]].get('id')}: {str(group_results)}")
+            else:
+                results.extend(result for result in group_results if result)
+    finally:
+        # Stop the CSV writer once every queued row is written
+        if csv_writer_task:
+            await csv_queue.put(None)
+            await csv_writer_task
+        aggregate_file.close()
+        await close_api_clients()
     
     # Sort results by match score (descending)
     results.sort(key=lambda x: x.get('match_score', 0), reverse=True)
@@ -565,6 +1125,29 @@ async def analyze_jobs_batch(jobs: List[Dict[str, Any]], cv_file_path: str = CV_
     return results
 
 
+def find_latest_jobs_file(data_dir: str = DATA_DIR) -> Optional[str]:
+    """
+    Find the most recently modified jobs_*.jsonl (or older jobs_*.json) file.
+    
+    Scans the directory once, stating each matching entry a single time, and keeps
+    only the newest instead of sorting all of them.
+    
+    Args:
+        data_dir: Directory containing the jobs files
+        
+    Returns:
+        Path of the newest jobs file, or None if there is none
+    """
+    with os.scandir(data_dir) as entries:
+        newest = max(
+            (entry for entry in entries
+             if entry.name.startswith('jobs_') and entry.name.endswith(('.jsonl', '.json')) and entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime,
+            default=None
+        )
+    return newest.path if newest else None
+
+
 def extract_best_matches(analysis_results: List[Dict[str, Any]], 
                          threshold: float = MATCH_SCORE_THRESHOLD) -> List[Dict[str, Any]]:
     """
@@ -622,9 +1205,7 @@ async def run_analysis(jobs_file_path: str, cv_file_path: str = CV_FILE_PATH,
     
     # Load scraped jobs
     try:
-        with open(jobs_file_path, 'r', encoding='utf-8') as f:
-            jobs_data = json.load(f)
-            jobs = jobs_data.get('jobs', [])
+        jobs = load_jobs_file(jobs_file_path)
         logger.info(f"Loaded {len(jobs)} jobs from {jobs_file_path}")
     except Exception as e:
         logger.error(f"Failed to load jobs data: {str(e)}")
@@ -680,9 +1261,7 @@ async def run_analysis(jobs_file_path: str, cv_file_path: str = CV_FILE_PATH,
     
     # Load scraped jobs
     try:
-        with open(jobs_file_path, 'r', encoding='utf-8') as f:
-            jobs_data = json.load(f)
-            jobs = jobs_data.get('jobs', [])
+        jobs = load_jobs_file(jobs_file_path)
         logger.info(f"Loaded {len(jobs)} jobs from {jobs_file_path}")
     except Exception as e:
         logger.error(f"Failed to load jobs data: {str(e)}")
@@ -735,7 +1314,6 @@ async def run_analysis(jobs_file_path: str, cv_file_path: str = CV_FILE_PATH,
 if __name__ == "__main__":
     # This allows the module to be run directly for testing
     import argparse
-    import csv
     
     parser = argparse.ArgumentParser(description='Analyze job listings against a candidate CV')
     
@@ -761,13 +1339,10 @@ if __name__ == "__main__":
     # Auto-detect jobs file if not specified
     if not args.jobs_file:
         # Use the most recent jobs file if not specified
-        data_dir = Path(DATA_DIR)
-        job_files = list(data_dir.glob("jobs_*.json"))
-        job_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        if not job_files:
+        jobs_file_path = find_latest_jobs_file()
+        if not jobs_file_path:
             logger.error("No job files found")
             sys.exit(1)
-        jobs_file_path = str(job_files[0])
         logger.info(f"Auto-detected jobs file: {jobs_file_path}")
     else:
         jobs_file_path = args.jobs_file
@@ -14,11 +14,8 @@ For scheduled execution: Use cron or Task Scheduler
 
 import os
 import sys
-import json
 import asyncio
-import logging
 import argparse
-import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Union
@@ -29,37 +26,22 @@ load_dotenv()
 
 # Import from other modules
 from config import (
-    COUNTRIES, JOB_ROLES, JOB_TYPES, EXPERIENCE_LEVELS, REMOTE_SETTINGS, RECENT_JOBS_ONLY,
+    COUNTRIES, JOB_ROLES, JOB_ROLES_FLAT, JOB_TYPES, EXPERIENCE_LEVELS, REMOTE_SETTINGS, RECENT_JOBS_ONLY,
     MAX_JOBS_PER_SEARCH, CV_FILE_PATH, TIME_FILTER, MATCH_SCORE_THRESHOLD,
-    LOGS_DIR, DATA_DIR, RESULTS_DIR, MAX_JOBS_TO_ANALYZE, LLM_MODEL, LLM_PROVIDER
+    setup_logging, DATA_DIR, RESULTS_DIR, MAX_JOBS_TO_ANALYZE, LLM_MODEL, LLM_PROVIDER,
+    APIFY_MAX_CONCURRENT_RUNS
 )
-from apify_scraper import create_search_configs, run_apify_linkedin_scraper
-from cv_parser import parse_markdown_cv, format_cv_for_prompt
-from llm_analyzer import analyze_jobs_batch, extract_best_matches, run_analysis
+from apify_scraper import create_search_configs, run_apify_linkedin_scraper, load_jobs_file, write_jobs_file_async, write_json_file
+from cv_parser import load_cv_for_prompt
+from llm_analyzer import analyze_jobs_batch, extract_best_matches, find_latest_jobs_file, run_analysis
 from sheets_integration import save_analyzed_jobs_to_sheet, create_sheet_if_not_exists
 from job_database import (
-    initialize_database, add_jobs_to_database, filter_new_jobs,
+    initialize_database, upsert_and_return_new,
     mark_jobs_as_processed, record_scraping_run, get_recent_job_stats
 )
 
-# Create necessary directories
-os.makedirs(LOGS_DIR, exist_ok=True)
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(RESULTS_DIR, exist_ok=True)
-
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, "main.log")),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("main")
-
-# Initialize job database
-initialize_database()
+logger = setup_logging("main", "main.log")
 
 
 def load_config_profile(profile_name: Optional[str] = None) -> Dict[str, Any]:
@@ -81,9 +63,12 @@ def load_config_profile(profile_name: Optional[str] = None) -> Dict[str, Any]:
         logger.warning(f"Profile '{profile_name}' not found at {profile_path}")
         return {}
         
+    # Imported here as only profile runs need it; libyaml's C parser is used when available
+    import yaml
+    
     try:
         with open(profile_path, 'r', encoding='utf-8') as f:
-            profile_data = yaml.safe_load(f)
+            profile_data = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
             logger.info(f"Loaded configuration profile: {profile_name}")
             return profile_data or {}
     except Exception as e:
@@ -107,9 +92,13 @@ def save_config_profile(profile_name: str, config_data: Dict[str, Any]) -> bool:
     
     profile_path = profile_dir / f"{profile_name}.yaml"
     
+    # Imported here as only profile runs need it; libyaml's C emitter is used when available
+    import yaml
+    
     try:
         with open(profile_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config_data, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(config_data, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper),
+                      default_flow_style=False, sort_keys=False)
             logger.info(f"Saved configuration profile: {profile_name}")
             return True
     except Exception as e:
@@ -126,6 +115,9 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
     """
     logger.info("Starting LinkedIn job search and analysis process")
     start_time = datetime.now()
+    initialize_database()
+    # One timestamp names every artifact of this run (run ID, jobs file, analysis directory)
+    timestamp = start_time.strftime("%Y%m%d_%H%M%S")
     
     # Load configuration profile if specified
     profile_config = {}
@@ -141,6 +133,7 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
         "remote_settings": REMOTE_SETTINGS,
         "recent_jobs_only": RECENT_JOBS_ONLY,
         "max_jobs_per_search": MAX_JOBS_PER_SEARCH,
+        "max_concurrent_searches": APIFY_MAX_CONCURRENT_RUNS,
         "max_jobs_to_analyze": MAX_JOBS_TO_ANALYZE,
         "cv_file_path": CV_FILE_PATH,
         "time_filter": TIME_FILTER,
@@ -155,7 +148,13 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
     if config_overrides:
         config.update(config_overrides)
         
-    logger.info(f"Using configuration with {len(config['countries'])} countries and {sum(len(roles) for roles in config['job_roles'].values())} job roles")
+    # Flatten the roles once; the count below and the search configs both use the pairs
+    if config["job_roles"] is JOB_ROLES:
+        job_roles_flat = JOB_ROLES_FLAT
+    else:
+        job_roles_flat = tuple((category, role) for category, roles in config["job_roles"].items() for role in roles)
+    
+    logger.info(f"Using configuration with {len(config['countries'])} countries and {len(job_roles_flat)} job roles")
     
     # Step 1: Ensure Google Sheet exists (if not skipped)
     if not skip_sheets:
@@ -168,6 +167,9 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
     else:
         logger.info("Skipping Google Sheets integration as requested")
     
+    # Background write of the scraped jobs file, overlapping the CV parsing
+    jobs_file_task = None
+    
     # Step 2: Scrape jobs from LinkedIn using Apify
     if not skip_scraping:
         logger.info("Step 2: Scraping jobs from LinkedIn using Apify")
@@ -181,7 +183,7 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
             # Create search configurations
             search_configs = create_search_configs(
                 countries=config["countries"],
-                job_roles=config["job_roles"],
+                job_roles=job_roles_flat,
                 jobs_per_search=config["max_jobs_per_search"],
                 job_types=config["job_types"],
                 experience_levels=config["experience_levels"],
@@ -190,8 +192,11 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
                 time_filter=config["time_filter"]
             )
             
-            # Run Apify scraper
-            scrape_result = await run_apify_linkedin_scraper(api_key, search_configs)
+            # Run Apify scraper (reusing cached results of identical recent runs unless forced)
+            scrape_result = await run_apify_linkedin_scraper(
+                api_key, search_configs, use_cache=not config.get("force_scrape", False),
+                max_concurrent_runs=config["max_concurrent_searches"]
+            )
             
             if 'error' in scrape_result:
                 logger.error(f"Apify scraping failed: {scrape_result['error']}")
@@ -200,24 +205,20 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
             all_jobs = scrape_result['jobs']
             logger.info(f"Successfully scraped {len(all_jobs)} jobs from LinkedIn")
             
-            # Filter out jobs that we've already processed to save API costs
-            new_jobs = filter_new_jobs(all_jobs)
+            # Add all jobs to database (new ones will be added, existing ones updated) and
+            # pick out the new ones, so we only analyze those to save API costs
+            new_jobs, db_result = upsert_and_return_new(all_jobs)
             logger.info(f"Found {len(new_jobs)} new jobs that haven't been processed before")
-            
-            # Add all jobs to database (new ones will be added, existing ones updated)
-            db_result = add_jobs_to_database(all_jobs)
             logger.info(f"Added {db_result['new']} new jobs to database, updated {db_result['updated']} existing jobs")
             
             # Record this scraping run in the database
-            run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            run_id = f"run_{timestamp}"
             record_scraping_run(run_id, search_configs[0], len(all_jobs), db_result['new'])
             
-            # Save all scraped jobs to file (including duplicates for record keeping)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            jobs_file_path = os.path.join(DATA_DIR, f"jobs_{timestamp}.json")
-            
-            with open(jobs_file_path, 'w', encoding='utf-8') as f:
-                json.dump({'timestamp': timestamp, 'jobs': all_jobs}, f, indent=2, ensure_ascii=False)
+            # Save all scraped jobs to file (including duplicates for record keeping) in a
+            # worker thread, so the CV is parsed while the file is written
+            jobs_file_path = os.path.join(DATA_DIR, f"jobs_{timestamp}.jsonl")
+            jobs_file_task = asyncio.ensure_future(write_jobs_file_async(jobs_file_path, timestamp, all_jobs))
                 
             # Use only new jobs for analysis to save on API costs
             if new_jobs:
@@ -230,37 +231,31 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
                 jobs_data = all_jobs[:max_jobs]
                 logger.info(f"No new jobs found, will analyze {len(jobs_data)} recent jobs")
                 
-            logger.info(f"Saved scraped jobs to: {jobs_file_path}")
-            
         except Exception as e:
             logger.error(f"Error during job scraping: {str(e)}")
             return
     else:
         logger.info("Skipping job scraping, using most recent data")
         # Find the most recent jobs file
-        data_dir = Path(DATA_DIR)
-        job_files = list(data_dir.glob("jobs_*.json"))
-        job_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+        jobs_file_path = find_latest_jobs_file(DATA_DIR)
         
-        if not job_files:
+        if not jobs_file_path:
             logger.error("No job files found. Run without --skip-scraping flag first.")
             return
             
-        jobs_file_path = str(job_files[0])
         logger.info(f"Using most recent jobs file: {jobs_file_path}")
         
         # Load the jobs data
-        with open(jobs_file_path, 'r', encoding='utf-8') as f:
-            jobs_data = json.load(f).get('jobs', [])
+        jobs_data = load_jobs_file(jobs_file_path)
             
         logger.info(f"Loaded {len(jobs_data)} jobs from file")
     
-    # Step 3: Parse the CV
+    # Step 3: Parse the CV (cached across runs while the file is unchanged; the analysis
+    # step reads the same cache entry)
     logger.info("Step 3: Parsing the CV")
     try:
-        cv_data = parse_markdown_cv(CV_FILE_PATH)
-        cv_text = format_cv_for_prompt(cv_data)
-        logger.info(f"Successfully parsed CV from {CV_FILE_PATH}")
+        cv_text = load_cv_for_prompt(config["cv_file_path"])
+        logger.info(f"Successfully parsed CV from {config['cv_file_path']}")
     except Exception as e:
         logger.error(f"Error parsing CV: {str(e)}")
         return
@@ -269,33 +264,39 @@ async def main(skip_scraping=False, skip_sheets=False, config_overrides=None, pr
     logger.info("Step 4: Analyzing jobs against CV")
     try:
         # Create output directory for analysis results
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_dir = Path(RESULTS_DIR) / f"analysis_{timestamp}"
         os.makedirs(output_dir, exist_ok=True)
         
-        # Analyze jobs in batch
-        # Limit the number of jobs to analyze if specified
-        if config["max_jobs_to_analyze"] and len(jobs_data) > config["max_jobs_to_analyze"]:
-            logger.info(f"Limiting analysis to {config['max_jobs_to_analyze']} jobs (out of {len(jobs_data)})")
-            jobs_data = jobs_data[:config["max_jobs_to_analyze"]]
-            
-        analysis_results = await analyze_jobs_batch(jobs_data, config["cv_file_path"])
+        # Analyze jobs in batch; the prefilter keeps the jobs most relevant to the CV,
+        # up to the configured limit (no limit if unset)
+        max_jobs = config["max_jobs_to_analyze"] or len(jobs_data)
+        
+        # The analysis annotates the job dictionaries, so the jobs file must be written first
+        if jobs_file_task:
+            try:
+                logger.info(f"Saved scraped jobs to: {await jobs_file_task}")
+            except Exception as e:
+                logger.error(f"Error saving scraped jobs: {str(e)}")
+        
+        analysis_results = await analyze_jobs_batch(jobs_data, config["cv_file_path"], max_jobs=max_jobs)
         
         # Extract best matches based on the configured threshold
         best_matches = extract_best_matches(analysis_results, threshold=config["match_score_threshold"])
         
         logger.info(f"Analysis complete. Found {len(best_matches)} matching jobs.")
         
+        # Flag every analyzed job in the database with one batched update
+        mark_jobs_as_processed(result['job_id'] for result in analysis_results if result['job_id'])
+        
         # Save to file
         summary_file = output_dir / "summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'timestamp': datetime.now().isoformat(),
-                'total_jobs': len(jobs_data),
-                'analyzed_jobs': len(analysis_results),
-                'matching_jobs': len(best_matches),
-                'matching_job_ids': [job.get('job_id') for job in best_matches]
-            }, f, indent=2, ensure_ascii=False)
+        write_json_file(str(summary_file), {
+            'timestamp': datetime.now().isoformat(),
+            'total_jobs': len(jobs_data),
+            'analyzed_jobs': len(analysis_results),
+            'matching_jobs': len(best_matches),
+            'matching_job_ids': [job.get('job_id') for job in best_matches]
+        }, pretty=True)
             
     except Exception as e:
         logger.error(f"Error during job analysis: {str(e)}")
@@ -329,6 +330,7 @@ if __name__ == "__main__":
     parser.add_argument("--skip-scraping", action="store_true", help="Skip job scraping and use most recent data")
     parser.add_argument("--skip-sheets", action="store_true", help="Skip Google Sheets integration")
     parser.add_argument("--force-update", action="store_true", help="Force update existing entries in Google Sheets")
+    parser.add_argument("--force-scrape", action="store_true", help="Ignore cached Apify results and scrape again")
     parser.add_argument("--profile", type=str, help="Use a saved configuration profile")
     parser.add_argument("--save-profile", type=str, help="Save the current configuration as a profile")
     
@@ -340,6 +342,8 @@ if __name__ == "__main__":
     parser.add_argument("--remote", type=str, nargs="*", help="Remote work settings")
     parser.add_argument("--recent-only", action="store_true", help="Only include recent jobs")
     parser.add_argument("--time-filter", type=str, help="Time filter for job listings (e.g., 'r2592000' for 30 days)")
+    parser.add_argument("--max-concurrent-searches", type=int,
+                        help=f"Maximum number of Apify scraper runs in flight at once (default: {APIFY_MAX_CONCURRENT_RUNS})")
     
     # Analysis configuration options
     parser.add_argument("--cv-file", type=str, help="Path to the CV markdown file")
@@ -370,6 +374,8 @@ if __name__ == "__main__":
         config_overrides["recent_jobs_only"] = True
     if args.time_filter:
         config_overrides["time_filter"] = args.time_filter
+    if args.max_concurrent_searches:
+        config_overrides["max_concurrent_searches"] = args.max_concurrent_searches
     if args.cv_file:
         config_overrides["cv_file_path"] = args.cv_file
     if args.max_jobs:
@@ -382,6 +388,8 @@ if __name__ == "__main__":
         config_overrides["max_jobs_to_analyze"] = args.max_analyze
     if args.force_update:
         config_overrides["force_update"] = True
+    if args.force_scrape:
+        config_overrides["force_scrape"] = True
     if args.match_threshold is not None:
         config_overrides["match_score_threshold"] = args.match_threshold
     if args.llm_model:
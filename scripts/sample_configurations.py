@@ -17,6 +17,9 @@ DATA_DIR = Path(__file__).parent.parent / "data"
 PROFILES_DIR = DATA_DIR / "profiles"
 os.makedirs(PROFILES_DIR, exist_ok=True)
 
+# libyaml's C emitter when PyYAML was built with it
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 # Example configuration profiles
 EXAMPLE_PROFILES = {
     "tech_jobs_usa": {
@@ -69,7 +72,7 @@ def save_example_profiles():
     for name, config in EXAMPLE_PROFILES.items():
         profile_path = PROFILES_DIR / f"{name}.yaml"
         with open(profile_path, "w", encoding="utf-8") as f:
-            yaml.dump(config, f, default_flow_style=False)
+            yaml.dump(config, f, Dumper=YAML_DUMPER, default_flow_style=False)
         print(f"Saved example profile: {name}")
 
 def show_example_commands():
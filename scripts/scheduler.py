@@ -6,9 +6,7 @@ This module handles the scheduling of the LinkedIn job search and analysis proce
 using a cron-like scheduler (APScheduler).
 """
 
-import os
 import sys
-import logging
 import asyncio
 from datetime import datetime
 from pathlib import Path
@@ -16,21 +14,39 @@ from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 # Import from other modules
-from config import RUN_SCHEDULE, LOGS_DIR
+from config import RUN_SCHEDULE, setup_logging
 from main import main as run_main_process
 from job_database import get_recent_job_stats
 
 # Configure logging
-os.makedirs(LOGS_DIR, exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, "scheduler.log")),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("scheduler")
+logger = setup_logging("scheduler", "scheduler.log")
+
+# Event loop shared by all scheduled runs, created on first use
+_loop = None
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop the scheduled runs execute in, creating it on first use.
+    
+    Reusing one loop across runs, instead of asyncio.run's fresh loop per trigger, keeps
+    its default thread pool (used for the file and CV work) alive between runs.
+    
+    Returns:
+        The shared event loop
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
+def _close_event_loop() -> None:
+    """Shut down the shared event loop, if one was created."""
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+        _loop.run_until_complete(_loop.shutdown_default_executor())
+        _loop.close()
 
 
 def scheduled_job():
@@ -42,7 +58,7 @@ def scheduled_job():
         logger.info(f"Current job database contains {stats_before['total_jobs']} total jobs, {stats_before['new_jobs_last_days']} new in last week")
         
         # Run the main process with new scraping
-        asyncio.run(run_main_process(skip_scraping=False))
+        _get_event_loop().run_until_complete(run_main_process(skip_scraping=False))
         
         # Get stats after running to show what changed
         stats_after = get_recent_job_stats(days=7)
@@ -94,6 +110,8 @@ def start_scheduler():
         logger.info("Scheduler stopped by user")
     except Exception as e:
         logger.error(f"Error in scheduler: {str(e)}")
+    finally:
+        _close_event_loop()
 
 
 if __name__ == "__main__":
@@ -102,6 +120,7 @@ if __name__ == "__main__":
         if sys.argv[1] == "--run-now":
             logger.info("Running job immediately")
             scheduled_job()
+            _close_event_loop()
         elif sys.argv[1] == "--stats":
             # Show database stats
             stats = get_recent_job_stats()
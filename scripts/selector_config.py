@@ -14,8 +14,16 @@ Development Rules:
 
 import re
 import logging
-from typing import Dict, List, Optional, Any
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple, Union
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    import lxml  # Optional: C-based HTML parser, several times faster than html.parser
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +32,7 @@ logger = logging.getLogger(__name__)
 # ==========================================
 
 # Primary selectors (in order of priority)
-JOB_DESCRIPTION_PRIMARY_SELECTORS = [
+JOB_DESCRIPTION_PRIMARY_SELECTORS = (
     # Main content container for job descriptions in newer LinkedIn formats
     ".description__text",
     
@@ -36,10 +44,10 @@ JOB_DESCRIPTION_PRIMARY_SELECTORS = [
     
     # Standard job description container used in most job listings
     ".job-description__content"
-]
+)
 
 # Fallback selectors (used if primary selectors don't match)
-JOB_DESCRIPTION_FALLBACK_SELECTORS = [
+JOB_DESCRIPTION_FALLBACK_SELECTORS = (
     # ID-based selector for job detail container (highly specific)
     "#job-details",
     
@@ -51,7 +59,7 @@ JOB_DESCRIPTION_FALLBACK_SELECTORS = [
     
     # HTML content box in job listings (very generic)
     ".jobs-box__html-content"
-]
+)
 
 # Combined selectors in priority order
 JOB_DESCRIPTION_SELECTORS = JOB_DESCRIPTION_PRIMARY_SELECTORS + JOB_DESCRIPTION_FALLBACK_SELECTORS
@@ -61,28 +69,127 @@ JOB_DESCRIPTION_SELECTORS = JOB_DESCRIPTION_PRIMARY_SELECTORS + JOB_DESCRIPTION_
 # ==========================================
 
 # Selectors for job title elements
-JOB_TITLE_SELECTORS = [
+JOB_TITLE_SELECTORS = (
     ".job-details-jobs-unified-top-card__job-title",
     ".jobs-unified-top-card__job-title",
     ".jobs-details-top-card__job-title",
     "h1.jobs-title"
-]
+)
 
 # Selectors for company name elements
-COMPANY_NAME_SELECTORS = [
+COMPANY_NAME_SELECTORS = (
     ".job-details-jobs-unified-top-card__company-name",
     ".jobs-unified-top-card__company-name",
     ".jobs-details-top-card__company-info a",
     ".jobs-details-top-card__company-url"
-]
+)
 
 # Selectors for job location elements
-LOCATION_SELECTORS = [
+LOCATION_SELECTORS = (
     ".job-details-jobs-unified-top-card__bullet",
     ".jobs-unified-top-card__bullet",
     ".jobs-details-top-card__bullet",
     ".jobs-details-top-card__workplace-type"
-]
+)
+
+# Every selector get_job_description looks up in a job page
+PAGE_SELECTORS = JOB_DESCRIPTION_SELECTORS + JOB_TITLE_SELECTORS + COMPANY_NAME_SELECTORS + LOCATION_SELECTORS
+
+# ==========================================
+# Content Validation and Cleaning Patterns
+# ==========================================
+
+# Keywords common in job descriptions; valid content contains at least two of them
+JOB_DESCRIPTION_KEYWORDS = (
+    'responsibilities', 'requirements', 'qualifications', 
+    'experience', 'skills', 'about the role', 'about the job',
+    'what you\'ll do', 'what we\'re looking for'
+)
+
+# Any of the tags (<p>, <li>, <br>) that give a job description its structure
+HTML_STRUCTURE_RE = re.compile(r'<(?:p>|li>|br)')
+
+# Class names of hidden elements removed from job descriptions
+HIDDEN_CLASS_NAMES = ('hidden', 'visually-hidden')
+
+# Whitespace cleanup patterns, compiled once at import
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+SPACES_RE = re.compile(r'[ \t]+')
+
+# ==========================================
+# Parsing Helpers
+# ==========================================
+
+# Leading id or class of a CSS selector, e.g. "job-details" in "#job-details" or
+# "jobs-title" in "h1.jobs-title"
+SELECTOR_ANCHOR_RE = re.compile(r'^[\w-]*([#.])([\w-]+)')
+
+# A selector made of a single class or id, optionally qualified by a tag name
+SIMPLE_SELECTOR_RE = re.compile(r'^([a-zA-Z][\w-]*)?([#.])([\w-]+)$')
+
+class _SelectorAnchorStrainer(SoupStrainer):
+    """
+    Parse filter keeping only the elements a set of selectors can match, with their contents.
+    
+    An element (and everything inside it) is kept when its id, or one of its classes, is
+    the leading id or class of one of the selectors. The rest of the page is never turned
+    into Python objects.
+    """
+    
+    def __init__(self, ids: Sequence[str], classes: Sequence[str]):
+        super().__init__()
+        self.anchor_ids = frozenset(ids)
+        self.anchor_classes = frozenset(classes)
+    
+    def _keeps(self, attrs: Any) -> bool:
+        attrs = attrs if isinstance(attrs, dict) else dict(attrs or ())
+        if attrs.get('id') in self.anchor_ids:
+            return True
+        classes = attrs.get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return not self.anchor_classes.isdisjoint(classes)
+    
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Any) -> bool:
+        # Consulted by beautifulsoup4 >= 4.13 for top-level tags while parsing
+        return self._keeps(attrs)
+    
+    def search_tag(self, markup_name: Any = None, markup_attrs: Any = None) -> bool:
+        # Consulted by older beautifulsoup4 versions for top-level tags while parsing
+        return self._keeps(markup_attrs)
+
+@lru_cache(maxsize=32)
+def selector_strainer(selectors: Tuple[str, ...]) -> Optional[SoupStrainer]:
+    """
+    Build a parse filter restricting parsing to what the selectors can match.
+    
+    Args:
+        selectors: CSS selectors that will be searched in the parsed document
+        
+    Returns:
+        Optional[SoupStrainer]: Filter for parse_html, or None if a selector has no leading
+        id or class to filter on (the whole document must be parsed then)
+    """
+    ids, classes = [], []
+    for selector in selectors:
+        match = SELECTOR_ANCHOR_RE.match(selector)
+        if not match:
+            return None
+        (ids if match.group(1) == '#' else classes).append(match.group(2))
+    return _SelectorAnchorStrainer(ids, classes)
+
+def parse_html(html: str, strainer: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse HTML content with the fastest available parser (lxml if installed).
+    
+    Args:
+        html: The HTML content to parse
+        strainer: Parse only the elements this filter keeps (see selector_strainer)
+        
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=strainer)
 
 # ==========================================
 # Content Validation Functions
@@ -102,22 +209,21 @@ def is_valid_job_description(content: str) -> bool:
         logger.debug("Content too short to be a valid job description")
         return False
     
-    # Check for common job description keywords
-    job_related_keywords = [
-        'responsibilities', 'requirements', 'qualifications', 
-        'experience', 'skills', 'about the role', 'about the job',
-        'what you\'ll do', 'what we\'re looking for'
-    ]
-    
+    # Check for common job description keywords, stopping at the second one found
     content_lower = content.lower()
-    keyword_matches = [keyword for keyword in job_related_keywords if keyword in content_lower]
+    keyword_matches = []
+    for keyword in JOB_DESCRIPTION_KEYWORDS:
+        if keyword in content_lower:
+            keyword_matches.append(keyword)
+            if len(keyword_matches) >= 2:
+                break
     
     if len(keyword_matches) < 2:
         logger.debug(f"Content lacks job description keywords. Found only: {keyword_matches}")
         return False
     
     # Verify content has some structure (paragraphs, lists)
-    if '<p>' not in content and '<li>' not in content and '<br' not in content:
+    if not HTML_STRUCTURE_RE.search(content):
         logger.debug("Content lacks HTML structure expected in job descriptions")
         return False
     
@@ -127,12 +233,42 @@ def is_valid_job_description(content: str) -> bool:
 # Content Cleaning Functions
 # ==========================================
 
-def clean_job_description(html_content: str) -> str:
+def _has_hidden_style(value: Optional[str]) -> bool:
+    """Check whether a style attribute value hides the element."""
+    return bool(value) and 'display:none' in value.replace(' ', '')
+
+def _has_hidden_class(value: Optional[str]) -> bool:
+    """Check whether a class name marks the element as hidden."""
+    return bool(value) and any(c in value for c in HIDDEN_CLASS_NAMES)
+
+def _is_hidden(element: Tag) -> bool:
+    """Check whether an element is hidden by its style attribute or one of its classes."""
+    attrs = element.attrs
+    return _has_hidden_style(attrs.get('style')) or any(_has_hidden_class(c) for c in attrs.get('class') or ())
+
+def _is_removed_by_cleaning(element: Tag) -> bool:
+    """
+    Check whether clean_job_description would remove the element itself.
+    
+    Args:
+        element: Element to check
+        
+    Returns:
+        bool: True if the element is a script/style element, hidden, or an empty paragraph or div
+    """
+    if element.name in ('script', 'style', 'iframe', 'noscript'):
+        return True
+    if _is_hidden(element):
+        return True
+    return element.name in ('p', 'div') and not element.get_text(strip=True) and not element.find_all(['img', 'svg'])
+
+def clean_job_description(html_content: Union[str, Tag]) -> str:
     """
     Clean job description HTML content by removing unwanted elements and formatting.
     
     Args:
-        html_content: The HTML content to clean
+        html_content: The HTML content to clean, or an element of an already parsed page
+            (cleaned in place, without serializing and parsing it again)
         
     Returns:
         str: Cleaned HTML content
@@ -140,18 +276,21 @@ def clean_job_description(html_content: str) -> str:
     if not html_content:
         return ""
     
-    # Parse HTML content
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Parse HTML content, unless given an element (whose own tag is part of the output, as
+    # the outermost tag of a fragment would be, so it is checked for removal like one)
+    if isinstance(html_content, Tag):
+        if _is_removed_by_cleaning(html_content):
+            return ""
+        soup = html_content
+    else:
+        soup = parse_html(html_content)
     
     # Remove script and style elements
     for element in soup(['script', 'style', 'iframe', 'noscript']):
         element.decompose()
     
-    # Remove hidden elements
-    for element in soup.find_all(style=lambda value: value and 'display:none' in value.replace(' ', '')):
-        element.decompose()
-    
-    for element in soup.find_all(class_=lambda value: value and any(c in value for c in ['hidden', 'visually-hidden'])):
+    # Remove hidden elements, by style or class, in a single pass over the tree
+    for element in soup.find_all(_is_hidden):
         element.decompose()
     
     # Remove empty paragraphs and divs
@@ -159,44 +298,192 @@ def clean_job_description(html_content: str) -> str:
         if not tag.get_text(strip=True) and not tag.find_all(['img', 'svg']):
             tag.decompose()
     
+    # Serialize the fragment (lxml wraps it in <html><body>, which is dropped here)
+    if isinstance(html_content, Tag):
+        html = str(soup)
+    else:
+        html = (soup.body if soup.body is not None else soup).decode_contents()
+    
     # Clean up whitespace
-    html = str(soup)
-    html = re.sub(r'\n\s*\n', '\n\n', html)  # Remove extra line breaks
-    html = re.sub(r'[ \t]+', ' ', html)      # Replace multiple spaces with a single space
+    html = BLANK_LINES_RE.sub('\n\n', html)  # Remove extra line breaks
+    html = SPACES_RE.sub(' ', html)          # Replace multiple spaces with a single space
     
     return html
 
+def _cleaned_text(element: Tag) -> str:
+    """
+    Get the text of an element cleaned by clean_job_description, one string per line.
+    
+    Gives the text of the cleaned HTML without parsing it again: text nodes left next to
+    each other by removed elements are merged, as they would be in the reparsed HTML, and
+    their whitespace is cleaned up the same way.
+    
+    Args:
+        element: Element cleaned in place by clean_job_description
+        
+    Returns:
+        str: Text content of the element
+    """
+    element.smooth()
+    text = element.get_text('\n', strip=True)
+    text = BLANK_LINES_RE.sub('\n\n', text)
+    return SPACES_RE.sub(' ', text)
+
 # ==========================================
 # Extraction Helper Functions
 # ==========================================
 
-def extract_with_selectors(html: str, selectors: List[str]) -> Optional[str]:
+@lru_cache(maxsize=128)
+def _selector_finder(selector: str) -> Callable[[BeautifulSoup], Optional[Tag]]:
     """
-    Extract content from HTML using a list of selectors in priority order.
+    Get a function finding the first element matched by a CSS selector.
+    
+    Single class or id selectors (like ".description__text" or "h1.jobs-title") use
+    find() directly, skipping the CSS selector engine; other selectors are compiled once
+    with soupsieve instead of on every select_one() call.
     
     Args:
-        html: The HTML content to parse
-        selectors: List of CSS selectors in priority order
+        selector: CSS selector
         
     Returns:
-        Optional[str]: Extracted HTML content or None if no matching elements found
+        Callable[[BeautifulSoup], Optional[Tag]]: Function returning the first matching element or None
     """
-    if not html:
-        return None
+    match = SIMPLE_SELECTOR_RE.match(selector)
+    if not match:
+        return soupsieve.compile(selector).select_one
+    
+    name, kind, value = match.groups()
+    attrs = {'class_': value} if kind == '.' else {'id': value}
+    if name:
+        return lambda soup: soup.find(name, **attrs)
+    return lambda soup: soup.find(**attrs)
+
+@lru_cache(maxsize=32)
+def _selector_index(families: Tuple[Tuple[str, ...], ...]) -> Tuple[Dict[Tuple[str, str], List[Tuple[int, int, Optional[str]]]], Tuple[int, ...]]:
+    """
+    Index single class or id selectors of several selector lists by the class or id they match.
     
-    soup = BeautifulSoup(html, 'html.parser')
+    Args:
+        families: Lists of CSS selectors, each in priority order
+        
+    Returns:
+        Tuple: Dict mapping ('.', class) and ('#', id) keys to (list index, priority, tag name)
+        entries, and the indices of the lists left out because one of their selectors isn't
+        a single class or id
+    """
+    index = {}
+    unindexed = []
+    for family_index, selectors in enumerate(families):
+        matches = [SIMPLE_SELECTOR_RE.match(selector) for selector in selectors]
+        if not all(matches):
+            unindexed.append(family_index)
+            continue
+        for priority, match in enumerate(matches):
+            name, kind, value = match.groups()
+            index.setdefault((kind, value), []).append((family_index, priority, name))
+    return index, tuple(unindexed)
+
+def select_first_each(soup: BeautifulSoup, families: Sequence[Sequence[str]]) -> List[Optional[Tag]]:
+    """
+    Find the first element matching each of several lists of selectors in priority order.
     
-    # Try each selector in order of priority
+    Lists made of single class or id selectors are all matched in one walk of the
+    document, looking each element's classes and id up in an index of the selectors,
+    instead of walking the document once per selector. Other lists go through select_first.
+    
+    Args:
+        soup: Parsed HTML document
+        families: Lists of CSS selectors, each in priority order
+        
+    Returns:
+        List[Optional[Tag]]: For each list, the first element matched by its highest-priority
+        matching selector, or None
+    """
+    families = tuple(tuple(selectors) for selectors in families)
+    index, unindexed = _selector_index(families)
+    
+    # Priority of the best match found so far for each list (len(selectors) if none yet)
+    best = [len(selectors) for selectors in families]
+    elements = [None] * len(families)
+    remaining = len(families) - len(unindexed)
+    
+    if index:
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            attrs = element.attrs
+            keys = [('.', c) for c in attrs.get('class') or ()]
+            if attrs.get('id'):
+                keys.append(('#', attrs['id']))
+            for key in keys:
+                for family_index, priority, name in index.get(key, ()):
+                    # Only a higher priority than the best match so far improves on it
+                    if priority < best[family_index] and (not name or element.name == name):
+                        best[family_index], elements[family_index] = priority, element
+                        if priority == 0:
+                            remaining -= 1
+            # Stop once every list has matched its top-priority selector
+            if not remaining:
+                break
+    
+    for family_index, selectors in enumerate(families):
+        if family_index in unindexed:
+            elements[family_index] = select_first(soup, selectors)
+        elif elements[family_index] is not None:
+            logger.debug(f"Found matching element with selector: {selectors[best[family_index]]}")
+        else:
+            logger.debug(f"No matching elements found for selectors: {selectors}")
+    
+    return elements
+
+def select_first(soup: BeautifulSoup, selectors: Sequence[str]) -> Optional[Tag]:
+    """
+    Find the first element matching a list of selectors in priority order.
+    
+    Args:
+        soup: Parsed HTML document
+        selectors: CSS selectors in priority order
+        
+    Returns:
+        Optional[Tag]: First element matched by the highest-priority matching selector, or None
+    """
+    # Match single class or id selectors in one walk of the document
+    if not _selector_index((tuple(selectors),))[1]:
+        return select_first_each(soup, (selectors,))[0]
+    
+    # Otherwise try each selector in order of priority
     for selector in selectors:
-        elements = soup.select(selector)
-        if elements:
+        element = _selector_finder(selector)(soup)
+        if element is not None:
             logger.debug(f"Found matching element with selector: {selector}")
-            # Return HTML content of the first matching element
-            return str(elements[0])
+            return element
     
     logger.debug(f"No matching elements found for selectors: {selectors}")
     return None
 
+def extract_with_selectors(html: Union[str, BeautifulSoup], selectors: Sequence[str]) -> Optional[str]:
+    """
+    Extract content from HTML using a list of selectors in priority order.
+    
+    Args:
+        html: The HTML content to parse, or an already parsed document
+        selectors: CSS selectors in priority order
+        
+    Returns:
+        Optional[str]: Extracted HTML content or None if no matching elements found
+    """
+    if not html:
+        return None
+    
+    if isinstance(html, BeautifulSoup):
+        soup = html
+    else:
+        soup = parse_html(html, selector_strainer(tuple(selectors)))
+    element = select_first(soup, selectors)
+    
+    # Return HTML content of the first matching element
+    return str(element) if element is not None else None
+
 def get_job_description(html: str) -> Optional[Dict[str, Any]]:
     """
     Extract job description from HTML content using configured selectors.
@@ -207,37 +494,37 @@ def get_job_description(html: str) -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict[str, Any]]: Dictionary with job description data or None if extraction fails
     """
-    # Extract the job description using selectors in priority order
-    description_html = extract_with_selectors(html, JOB_DESCRIPTION_SELECTORS)
+    # Parse the page once, and only the parts the selectors below can match
+    soup = parse_html(html, selector_strainer(PAGE_SELECTORS))
+    
+    # Find the job description, title, company name and location elements using
+    # selectors in priority order, in one walk of the page where possible
+    description_element, job_title_element, company_element, location_element = select_first_each(
+        soup, (JOB_DESCRIPTION_SELECTORS, JOB_TITLE_SELECTORS, COMPANY_NAME_SELECTORS, LOCATION_SELECTORS)
+    )
     
-    if not description_html:
+    if description_element is None:
         logger.warning("Failed to extract job description from HTML")
         return None
     
+    # Extract the job title, company name and location before the description is
+    # cleaned in place, as a broad description container may enclose them
+    job_title = job_title_element.get_text(strip=True) if job_title_element else None
+    company_name = company_element.get_text(strip=True) if company_element else None
+    location = location_element.get_text(strip=True) if location_element else None
+    
     # Clean the job description HTML
-    cleaned_html = clean_job_description(description_html)
+    cleaned_html = clean_job_description(description_element)
     
     # Validate the description content
     if not is_valid_job_description(cleaned_html):
         logger.warning("Extracted content does not appear to be a valid job description")
         return None
     
-    # Extract job title
-    job_title_element = extract_with_selectors(html, JOB_TITLE_SELECTORS)
-    job_title = BeautifulSoup(job_title_element, 'html.parser').get_text(strip=True) if job_title_element else None
-    
-    # Extract company name
-    company_element = extract_with_selectors(html, COMPANY_NAME_SELECTORS)
-    company_name = BeautifulSoup(company_element, 'html.parser').get_text(strip=True) if company_element else None
-    
-    # Extract location
-    location_element = extract_with_selectors(html, LOCATION_SELECTORS)
-    location = BeautifulSoup(location_element, 'html.parser').get_text(strip=True) if location_element else None
-    
     return {
         "job_title": job_title,
         "company_name": company_name,
         "location": location,
         "description_html": cleaned_html,
-        "description_text": BeautifulSoup(cleaned_html, 'html.parser').get_text('\n', strip=True)
+        "description_text": _cleaned_text(description_element)
     }
@@ -7,9 +7,9 @@ and prevent duplicates.
 """
 
 import os
+import re
+import csv
 import json
-import logging
-import pandas as pd
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
@@ -21,23 +21,35 @@ from google_auth_oauthlib.flow import Flow
 # Import from other modules
 from config import (
     GOOGLE_SHEET_ID, GOOGLE_SHEET_RANGE, GOOGLE_CREDENTIALS_FILE,
-    LOGS_DIR, RESULTS_DIR
+    setup_logging, RESULTS_DIR
 )
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, "sheets_integration.log")),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("sheets_integration")
+logger = setup_logging("sheets_integration", "sheets_integration.log")
 
 # Define the scopes for the Google Sheets API
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
+# Header row of the job analysis sheet (and columns of its local CSV copy)
+SHEET_HEADER = [
+    'Timestamp', 'Job Title', 'Company', 'Match Score', 
+    'Summary', 'Recommendation Code', 'Recommendation Details', 'URL', 'Job ID', 'Location', 'Seniority Level',
+    'Employment Type', 'Job Function', 'Industries', 'Posted Date',
+    'Company Website', 'Company LinkedIn', 'Salary',
+    'Human Fit Score', 'ATS Fit Score', 'Key Strengths', 'Critical Gaps',
+    'CV Tailoring', 'Experience Positioning', 'Talking Points',
+    'Description'
+]
+
+# Position of the job ID within a sheet row (column I when the range starts at A)
+JOB_ID_INDEX = SHEET_HEADER.index('Job ID')
+
+# Sheet name, first column and first row of an A1 range, e.g. 'Sheet1!A2:G'
+A1_RANGE_RE = re.compile(r'^(.+)!([A-Z]+)(\d*)')
+
+# Sheets API client shared by all functions in this module, built on first use
+_service = None
+
 def update_sheet_headers() -> bool:
     """
     Update the Google Sheet headers to ensure all columns exist.
@@ -53,23 +65,12 @@ def update_sheet_headers() -> bool:
             
         sheet = service.spreadsheets()
         
-        # Define the current complete header row with enhanced analysis fields
-        header = [
-            'Timestamp', 'Job Title', 'Company', 'Match Score', 
-            'Summary', 'Recommendation Code', 'Recommendation Details', 'URL', 'Job ID', 'Location', 'Seniority Level',
-            'Employment Type', 'Job Function', 'Industries', 'Posted Date',
-            'Company Website', 'Company LinkedIn', 'Salary',
-            'Human Fit Score', 'ATS Fit Score', 'Key Strengths', 'Critical Gaps',
-            'CV Tailoring', 'Experience Positioning', 'Talking Points',
-            'Description'
-        ]
-        
         # Update header row
         sheet.values().update(
             spreadsheetId=GOOGLE_SHEET_ID,
             range=GOOGLE_SHEET_RANGE.split('!')[0] + '!A1',
             valueInputOption='RAW',
-            body={'values': [header]}
+            body={'values': [SHEET_HEADER]}
         ).execute()
         
         logger.info(f"Updated header row in Google Sheet with all columns")
@@ -91,9 +92,9 @@ def get_credentials() -> Optional[Credentials]:
         token_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'token.json')
         if os.path.exists(token_path):
             logger.info(f"Using existing OAuth token from: {token_path}")
-            return UserCredentials.from_authorized_user_info(
-                json.load(open(token_path)), scopes=SCOPES
-            )
+            with open(token_path) as f:
+                token_info = json.load(f)
+            return UserCredentials.from_authorized_user_info(token_info, scopes=SCOPES)
 
         # No existing token, need to generate one using the credentials file
         if os.path.exists(GOOGLE_CREDENTIALS_FILE):
@@ -138,52 +139,75 @@ def get_credentials() -> Optional[Credentials]:
         return None
 
 
-def get_existing_job_data(sheet_id: str, sheet_range: str) -> Dict[str, Dict]:
+def _job_id_column_range(sheet_range: str) -> str:
+    """
+    Get the A1 range of the job ID column within a sheet range.
+    
+    Args:
+        sheet_range: Sheet range (e.g., 'Sheet1!A2:G')
+        
+    Returns:
+        Range of the job ID column from the same first row (e.g., 'Sheet1!I2:I'),
+        or sheet_range itself if it isn't in that form
+    """
+    match = A1_RANGE_RE.match(sheet_range)
+    if not match:
+        return sheet_range
+    sheet_name, first_column, first_row = match.groups()
+    
+    # Convert the column letters to a number, offset it and convert it back
+    number = 0
+    for letter in first_column:
+        number = number * 26 + ord(letter) - ord('A') + 1
+    number += JOB_ID_INDEX
+    column = ''
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        column = chr(ord('A') + remainder) + column
+    
+    return f"{sheet_name}!{column}{first_row}:{column}"
+
+
+def get_existing_job_rows(sheet_id: str, sheet_range: str) -> Dict[str, int]:
     """
-    Get existing job data from the Google Sheet, indexed by job ID.
+    Get the row indices of the jobs already in the Google Sheet, by job ID.
+    
+    Only the job ID column is fetched, rather than every column of every row.
     
     Args:
         sheet_id: Google Sheet ID
         sheet_range: Sheet range (e.g., 'Sheet1!A2:G')
         
     Returns:
-        Dictionary mapping job IDs to row indices and data
+        Dictionary mapping job IDs to 0-based row indices within the range
     """
     try:
         # Build the Sheets API client
         service = create_sheets_service()
         if not service:
             return {}
-            
-        sheet = service.spreadsheets()
         
-        # Get the current contents of the sheet
-        result = sheet.values().get(
+        # Get the job ID column (rows without a job ID come back empty)
+        id_range = _job_id_column_range(sheet_range)
+        result = service.spreadsheets().values().get(
             spreadsheetId=sheet_id,
-            range=sheet_range
+            range=id_range
         ).execute()
         
         values = result.get('values', [])
+        index = JOB_ID_INDEX if id_range == sheet_range else 0
+        job_rows = {row[index]: i for i, row in enumerate(values) if len(row) > index}
         
-        # Create a dictionary mapping job IDs to row indices and data
-        job_data = {}
-        for i, row in enumerate(values):
-            if len(row) >= 7:  # Ensure row has at least 7 columns (job ID is column 7)
-                job_id = row[6]
-                job_data[job_id] = {
-                    'row_index': i,  # 0-based index of the row in the sheet
-                    'data': row      # Full row data
-                }
-                
-        logger.info(f"Found {len(job_data)} existing job entries in Google Sheet")
-        return job_data
+        logger.info(f"Found {len(job_rows)} existing job entries in Google Sheet")
+        return job_rows
         
     except Exception as e:
         logger.error(f"Error getting existing job data from Google Sheet: {str(e)}")
         return {}
 
 
-def append_to_sheet(sheet_id: str, sheet_range: str, values: List[List[Any]], force_update: bool = False) -> bool:
+def append_to_sheet(sheet_id: str, sheet_range: str, values: List[List[Any]], force_update: bool = False,
+                    header: Optional[List[str]] = None) -> bool:
     """
     Append rows to the Google Sheet, avoiding duplicates. Can optionally update existing rows.
     
@@ -192,6 +216,8 @@ def append_to_sheet(sheet_id: str, sheet_range: str, values: List[List[Any]], fo
         sheet_range: Sheet range (e.g., 'Sheet1!A2:G')
         values: List of rows to append
         force_update: If True, update existing entries instead of skipping them
+        header: Header row to write to the first row of the sheet, in the same request
+            as the updated entries
         
     Returns:
         True if append was successful, False otherwise
@@ -207,8 +233,8 @@ def append_to_sheet(sheet_id: str, sheet_range: str, values: List[List[Any]], fo
             return False
         sheet = service.spreadsheets()
         
-        # Get existing job data
-        existing_job_data = get_existing_job_data(sheet_id, sheet_range)
+        # Get the rows of the jobs already in the sheet
+        existing_job_rows = get_existing_job_rows(sheet_id, sheet_range)
         
         # Track updates and new entries
         filtered_values = []  # New entries to append
@@ -216,14 +242,17 @@ def append_to_sheet(sheet_id: str, sheet_range: str, values: List[List[Any]], fo
         
         base_range = sheet_range.split('!')[0]  # Get sheet name without range
         
+        # Header row, if given, is written along with the updated entries
+        data = [{'range': f"{base_range}!A1", 'values': [header]}] if header else []
+        
         for row in values:
-            if len(row) >= 7:  # Ensure row has job ID
-                job_id = row[6]
+            if len(row) > JOB_ID_INDEX:  # Ensure row has job ID
+                job_id = row[JOB_ID_INDEX]
                 
-                if job_id in existing_job_data:
+                if job_id in existing_job_rows:
                     if force_update:
                         # Queue for update - format A1 notation for the range
-                        row_index = existing_job_data[job_id]['row_index'] + 2  # +2 because 1-based and header row
+                        row_index = existing_job_rows[job_id] + 2  # +2 because 1-based and header row
                         update_range = f"{base_range}!A{row_index}"
                         updates.append({
                             'range': update_range,
@@ -233,17 +262,22 @@ def append_to_sheet(sheet_id: str, sheet_range: str, values: List[List[Any]], fo
                     # New entry, queue for append
                     filtered_values.append(row)
         
-        # Process updates if needed
-        if force_update and updates:
+        # Process updates (and the header row) if needed
+        if force_update:
+            data.extend(updates)
+        if data:
             body = {
                 'valueInputOption': 'RAW',
-                'data': updates
+                'data': data
             }
             sheet.values().batchUpdate(
                 spreadsheetId=sheet_id,
                 body=body
             ).execute()
-            logger.info(f"Updated {len(updates)} existing job entries in Google Sheet")
+            if header:
+                logger.info("Updated header row in Google Sheet with all columns")
+            if force_update and updates:
+                logger.info(f"Updated {len(updates)} existing job entries in Google Sheet")
         
         # Append new entries if any
         if filtered_values:
@@ -279,8 +313,6 @@ def save_analyzed_jobs_to_sheet(analysis_results: List[Dict[str, Any]], force_up
     Returns:
         True if successful, False otherwise
     """
-    # First ensure headers are up to date - this will add any missing columns
-    update_sheet_headers()
     try:
         # Format the analysis results for Google Sheets
         sheet_rows = []
@@ -316,8 +348,14 @@ def save_analyzed_jobs_to_sheet(analysis_results: List[Dict[str, Any]], force_up
             ]
             sheet_rows.append(row)
         
-        # Append to Google Sheet, with option to force update existing entries
-        success = append_to_sheet(GOOGLE_SHEET_ID, GOOGLE_SHEET_RANGE, sheet_rows, force_update=force_update)
+        # With no rows there is no request to send the headers along with, so update them on their own
+        if not sheet_rows:
+            update_sheet_headers()
+        
+        # Append to Google Sheet, with option to force update existing entries, and
+        # bring the headers up to date in the same request - this will add any missing columns
+        success = append_to_sheet(GOOGLE_SHEET_ID, GOOGLE_SHEET_RANGE, sheet_rows,
+                                  force_update=force_update, header=SHEET_HEADER)
         
         if success:
             logger.info("Successfully saved job analysis results to Google Sheet")
@@ -326,19 +364,11 @@ def save_analyzed_jobs_to_sheet(analysis_results: List[Dict[str, Any]], force_up
         
         # Save a local copy as well
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        df = pd.DataFrame(
-            sheet_rows, 
-            columns=['Timestamp', 'Job Title', 'Company', 'Match Score', 'Summary', 'Recommendation Code', 'Recommendation Details', 'URL', 'Job ID',
-                    'Location', 'Seniority Level', 'Employment Type', 'Job Function', 'Industries',
-                    'Posted Date', 'Company Website', 'Company LinkedIn', 'Salary',
-                    'Human Fit Score', 'ATS Fit Score', 'Key Strengths', 'Critical Gaps',
-                    'CV Tailoring', 'Experience Positioning', 'Talking Points',
-                    'Description']
-        )
-        
-        os.makedirs(RESULTS_DIR, exist_ok=True)
         csv_path = os.path.join(RESULTS_DIR, f"job_analysis_{timestamp}.csv")
-        df.to_csv(csv_path, index=False)
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(SHEET_HEADER)
+            writer.writerows(sheet_rows)
         logger.info(f"Saved local copy of job analysis results to: {csv_path}")
         
         return success
@@ -353,15 +383,26 @@ def create_sheets_service():
     Create and return a Google Sheets API service instance.
     Uses OAuth credentials for full access to read/write/create Google Sheets.
     
+    The service is built once and reused by later calls, so the credentials are loaded
+    and the API client constructed only once per process.
+    
     Returns:
         Google Sheets API service instance or None if creation failed
     """
+    global _service
+    
+    if _service is not None:
+        return _service
+    
     try:
         # Get OAuth credentials - this will trigger the OAuth flow if needed
         credentials = get_credentials()
         if credentials:
             logger.info("Creating sheets service with OAuth credentials")
-            return build('sheets', 'v4', credentials=credentials)
+            # Use the discovery document bundled with the client library, without
+            # trying to read or write a discovery cache
+            _service = build('sheets', 'v4', credentials=credentials, cache_discovery=False)
+            return _service
         
         # If no credentials are available, show clear error message
         logger.error("OAuth credentials required for Google Sheets API operations")
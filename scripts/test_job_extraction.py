@@ -9,9 +9,13 @@ import json
 import logging
 import argparse
 from pathlib import Path
-from bs4 import BeautifulSoup
 import requests
 
+try:
+    import orjson  # Optional: much faster JSON serialization
+except ImportError:
+    orjson = None
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent.absolute()
 sys.path.append(str(project_root))
@@ -24,7 +28,9 @@ from scripts.selector_config import (
     LOCATION_SELECTORS,
     get_job_description,
     is_valid_job_description,
-    clean_job_description
+    clean_job_description,
+    parse_html,
+    select_first_each
 )
 
 # Configure logging
@@ -72,17 +78,19 @@ def load_test_html(file_path=None, url=None):
     logger.error("Either file_path or url must be provided")
     return None
 
-def test_selectors(html):
+def test_selectors(html, first_match=False):
     """
     Test all selectors on the provided HTML content.
     
     Args:
         html: HTML content to test against
+        first_match: Stop testing each group of selectors at its first match (for job
+            descriptions, the first valid one), as the extraction function does
         
     Returns:
         dict: Results of selector testing
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = parse_html(html)
     results = {
         "job_description": [],
         "job_title": [],
@@ -90,12 +98,18 @@ def test_selectors(html):
         "location": []
     }
     
+    # Find the first match of every selector up front, in one walk of the page
+    all_selectors = list(dict.fromkeys(
+        JOB_DESCRIPTION_SELECTORS + JOB_TITLE_SELECTORS + COMPANY_NAME_SELECTORS + LOCATION_SELECTORS
+    ))
+    matches = dict(zip(all_selectors, select_first_each(soup, [(selector,) for selector in all_selectors])))
+    
     # Test job description selectors
     logger.info("Testing job description selectors...")
     for selector in JOB_DESCRIPTION_SELECTORS:
-        elements = soup.select(selector)
-        if elements:
-            content = str(elements[0])
+        element = matches[selector]
+        if element is not None:
+            content = str(element)
             is_valid = is_valid_job_description(content)
             results["job_description"].append({
                 "selector": selector,
@@ -105,6 +119,8 @@ def test_selectors(html):
                 "preview": content[:100] + "..." if len(content) > 100 else content
             })
             logger.info(f"✅ Selector '{selector}' matched, valid: {is_valid}, length: {len(content)}")
+            if first_match and is_valid:
+                break
         else:
             results["job_description"].append({
                 "selector": selector,
@@ -115,15 +131,17 @@ def test_selectors(html):
     # Test job title selectors
     logger.info("Testing job title selectors...")
     for selector in JOB_TITLE_SELECTORS:
-        elements = soup.select(selector)
-        if elements:
-            text = elements[0].get_text(strip=True)
+        element = matches[selector]
+        if element is not None:
+            text = element.get_text(strip=True)
             results["job_title"].append({
                 "selector": selector,
                 "found": True,
                 "text": text
             })
             logger.info(f"✅ Job title selector '{selector}' matched: {text}")
+            if first_match and text:
+                break
         else:
             results["job_title"].append({
                 "selector": selector,
@@ -134,15 +152,17 @@ def test_selectors(html):
     # Test company name selectors
     logger.info("Testing company name selectors...")
     for selector in COMPANY_NAME_SELECTORS:
-        elements = soup.select(selector)
-        if elements:
-            text = elements[0].get_text(strip=True)
+        element = matches[selector]
+        if element is not None:
+            text = element.get_text(strip=True)
             results["company_name"].append({
                 "selector": selector,
                 "found": True,
                 "text": text
             })
             logger.info(f"✅ Company name selector '{selector}' matched: {text}")
+            if first_match and text:
+                break
         else:
             results["company_name"].append({
                 "selector": selector,
@@ -153,15 +173,17 @@ def test_selectors(html):
     # Test location selectors
     logger.info("Testing location selectors...")
     for selector in LOCATION_SELECTORS:
-        elements = soup.select(selector)
-        if elements:
-            text = elements[0].get_text(strip=True)
+        element = matches[selector]
+        if element is not None:
+            text = element.get_text(strip=True)
             results["location"].append({
                 "selector": selector,
                 "found": True,
                 "text": text
             })
             logger.info(f"✅ Location selector '{selector}' matched: {text}")
+            if first_match and text:
+                break
         else:
             results["location"].append({
                 "selector": selector,
@@ -204,8 +226,11 @@ def save_results(results, file_path):
         file_path: File path to save results to
     """
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            Path(file_path).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
         logger.info(f"Results saved to {file_path}")
     except Exception as e:
         logger.error(f"Failed to save results to {file_path}: {str(e)}")
@@ -223,6 +248,13 @@ def parse_arguments():
     
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
     
+    parser.add_argument('--full-report', action='store_true',
+                        help='Test every selector even when the extraction function succeeds')
+    
+    parser.add_argument('--first-match', action='store_true',
+                        help='Stop testing each selector group at its first (valid) match, like the extraction '
+                             'function; the summary then counts at most one match per group')
+    
     return parser.parse_args()
 
 def main():
@@ -241,9 +273,13 @@ def main():
     
     logger.info(f"Loaded HTML content ({len(html)} bytes)")
     
-    # Run tests
-    selector_results = test_selectors(html)
+    # Run the extraction function first; the per-selector report is only needed to
+    # diagnose a failed extraction, unless requested with --full-report
     extraction_results = test_extraction_function(html)
+    if extraction_results and not args.full_report:
+        selector_results = None
+    else:
+        selector_results = test_selectors(html, first_match=args.first_match)
     
     # Save results
     results = {
@@ -253,19 +289,23 @@ def main():
     save_results(results, args.output)
     
     # Summary
-    found_desc_selectors = sum(1 for item in selector_results["job_description"] if item.get("found", False))
-    found_title_selectors = sum(1 for item in selector_results["job_title"] if item.get("found", False))
-    found_company_selectors = sum(1 for item in selector_results["company_name"] if item.get("found", False))
-    found_location_selectors = sum(1 for item in selector_results["location"] if item.get("found", False))
-    
     logger.info("\n=== Test Summary ===")
-    logger.info(f"Job Description Selectors: {found_desc_selectors}/{len(JOB_DESCRIPTION_SELECTORS)} matched")
-    logger.info(f"Job Title Selectors: {found_title_selectors}/{len(JOB_TITLE_SELECTORS)} matched")
-    logger.info(f"Company Name Selectors: {found_company_selectors}/{len(COMPANY_NAME_SELECTORS)} matched")
-    logger.info(f"Location Selectors: {found_location_selectors}/{len(LOCATION_SELECTORS)} matched")
+    if selector_results is not None:
+        found_desc_selectors = sum(1 for item in selector_results["job_description"] if item.get("found", False))
+        found_title_selectors = sum(1 for item in selector_results["job_title"] if item.get("found", False))
+        found_company_selectors = sum(1 for item in selector_results["company_name"] if item.get("found", False))
+        found_location_selectors = sum(1 for item in selector_results["location"] if item.get("found", False))
+        
+        logger.info(f"Job Description Selectors: {found_desc_selectors}/{len(JOB_DESCRIPTION_SELECTORS)} matched")
+        logger.info(f"Job Title Selectors: {found_title_selectors}/{len(JOB_TITLE_SELECTORS)} matched")
+        logger.info(f"Company Name Selectors: {found_company_selectors}/{len(COMPANY_NAME_SELECTORS)} matched")
+        logger.info(f"Location Selectors: {found_location_selectors}/{len(LOCATION_SELECTORS)} matched")
+    else:
+        logger.info("Selector Tests: Skipped (use --full-report to test every selector)")
     logger.info(f"Extraction Function: {'Successful' if extraction_results else 'Failed'}")
     
-    return 0 if extraction_results and found_desc_selectors > 0 else 1
+    # A successful extraction implies a job description selector matched
+    return 0 if extraction_results else 1
 
 if __name__ == "__main__":
     sys.exit(main())
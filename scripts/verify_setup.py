@@ -25,6 +25,12 @@ logger = logging.getLogger("verify_setup")
 # Load environment variables from .env file
 load_dotenv()
 
+# Snapshot of the environment variables the checks below read
+_ENV = {
+    var: os.environ.get(var)
+    for var in ("APIFY_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_CREDENTIALS_FILE", "GOOGLE_SHEET_ID")
+}
+
 def check_environment_variables():
     """Check if all required environment variables are set"""
     required_vars = {
@@ -42,7 +48,7 @@ def check_environment_variables():
     logger.info("Checking environment variables...")
     
     for var, description in required_vars.items():
-        value = os.environ.get(var)
+        value = _ENV[var]
         if not value:
             missing_vars.append(var)
             logger.error(f"❌ Missing required environment variable: {var} ({description})")
@@ -50,7 +56,7 @@ def check_environment_variables():
             logger.info(f"✅ Found {var}")
     
     for var, description in optional_vars.items():
-        value = os.environ.get(var)
+        value = _ENV[var]
         if not value:
             logger.warning(f"⚠️ Missing optional environment variable: {var} ({description})")
         else:
@@ -60,7 +66,7 @@ def check_environment_variables():
 
 def verify_apify_api_key():
     """Verify that the Apify API key is present"""
-    api_key = os.environ.get("APIFY_API_KEY")
+    api_key = _ENV["APIFY_API_KEY"]
     if not api_key:
         logger.error("❌ APIFY_API_KEY environment variable is not set")
         return False
@@ -70,7 +76,7 @@ def verify_apify_api_key():
 
 def verify_anthropic_api_key():
     """Verify that the Anthropic API key (via OpenRouter) is valid"""
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    api_key = _ENV["ANTHROPIC_API_KEY"]
     if not api_key:
         return False
     
@@ -89,7 +95,8 @@ def verify_anthropic_api_key():
         # Simple model availability check
         response = requests.get(
             "https://openrouter.ai/api/v1/models",
-            headers=headers
+            headers=headers,
+            timeout=10
         )
         
         if response.status_code == 200:
@@ -123,8 +130,8 @@ def check_required_files():
         "CV Template": project_dir / "data" / "cv_template.md"
     }
     
-    if os.environ.get("GOOGLE_CREDENTIALS_FILE"):
-        credentials_path = os.environ.get("GOOGLE_CREDENTIALS_FILE")
+    credentials_path = _ENV["GOOGLE_CREDENTIALS_FILE"]
+    if credentials_path:
         if not credentials_path.startswith("/"):
             credentials_path = project_dir / credentials_path
         required_files["Google Credentials"] = Path(credentials_path)
@@ -4,10 +4,11 @@ Setup script for LinkedIn Job Search and Analysis project.
 This script verifies the environment setup and dependencies.
 """
 import os
+import re
 import sys
 import logging
-import importlib
-import subprocess
+import importlib.util
+from importlib.metadata import distributions
 from pathlib import Path
 
 # Configure logging
@@ -37,7 +38,7 @@ REQUIRED_ENV_VARS = ["APIFY_API_KEY", "ANTHROPIC_API_KEY"]
 REQUIRED_PACKAGES = [
     "requests", "anthropic", "google-api-python-client", 
     "google-auth-httplib2", "google-auth-oauthlib",
-    "pandas", "beautifulsoup4", "markdownify", "html2text",
+    "beautifulsoup4", "markdownify", "html2text",
     "aiohttp", "asyncio", "apscheduler", "python-dotenv", "tqdm", "pyyaml"
 ]
 
@@ -126,30 +127,22 @@ def check_env_variables():
     return True
 
 
+def normalize_package_name(name):
+    """Normalize a package name for comparison (e.g. 'Python_Dotenv' -> 'python-dotenv')."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
 def check_package_dependencies():
     """Check if required packages are installed."""
+    # Names of all installed distributions, from a single scan of their metadata
+    # instead of importing every package
+    installed = {normalize_package_name(dist.metadata["Name"]) for dist in distributions() if dist.metadata["Name"]}
+    
     missing_packages = []
     for package in REQUIRED_PACKAGES:
         base_package = package.split("[")[0]  # Handle packages with extras
-        try:
-            # Try multiple methods to check if package is installed
-            try:
-                importlib.import_module(base_package)
-            except ImportError:
-                # Some packages use different import names
-                if base_package == 'beautifulsoup4':
-                    importlib.import_module('bs4')
-                elif base_package == 'google-api-python-client':
-                    importlib.import_module('googleapiclient')
-                elif base_package == 'google-auth-httplib2':
-                    # This package doesn't have a direct module import
-                    subprocess.check_call([sys.executable, '-m', 'pip', 'show', base_package], 
-                                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                elif base_package == 'google-auth-oauthlib':
-                    importlib.import_module('google_auth_oauthlib')
-                else:
-                    raise ImportError(f"Could not import {base_package}")
-        except (ImportError, subprocess.CalledProcessError):
+        # Standard library modules (like asyncio) have no distribution metadata
+        if normalize_package_name(base_package) not in installed and importlib.util.find_spec(base_package) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -0,0 +1,31 @@
+"""
+Tests for the Skills section handling of the CV parser.
+"""
+import sys
+from pathlib import Path
+
+# The scripts import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from cv_parser import BULLET_PATTERN, extract_skills, format_cv_for_prompt
+
+
+def test_skills_one_per_line():
+    cv_data = {"Skills": "Python\nSQL\nGo"}
+    assert extract_skills(cv_data) == ["Python", "SQL", "Go"]
+    assert format_cv_for_prompt(cv_data) == "Skills:\nPython, SQL, Go"
+
+
+def test_prompt_keeps_plain_lines_next_to_bullets():
+    cv_data = {"Skills": "- Python\nSQL\n- Go"}
+    assert format_cv_for_prompt(cv_data) == "Skills:\nPython, SQL, Go"
+
+
+def test_bold_lines_are_not_bullets():
+    assert BULLET_PATTERN.findall("**Languages**\n- Python") == ["Python"]
+    assert extract_skills({"Skills": "**Languages**\n- Python\n- Go"}) == ["Python", "Go"]
+
+
+def test_bullet_does_not_run_into_next_line():
+    assert BULLET_PATTERN.findall("-\nPython\n- Go") == ["Go"]
+    assert BULLET_PATTERN.findall("- Python  \n- Go") == ["Python", "Go"]